@@ -1,80 +1,42 @@
+import os
+import sys
 import pandas as pd
-import yfinance as yf
-from datetime import datetime, timedelta
 
-# Extended dates of the first Fed rate cuts
-rate_cut_dates = [
-    "1987-10-20",
-    "1989-07-06",
-    "1991-07-02",
-    "1995-07-06",
-    "1998-09-29",
-    "2001-01-03",
-    "2007-09-18",
-    "2008-12-16",
-    "2019-07-31",
-    "2020-03-03",
-]
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from price_store import load_close
+from event_study import DEFAULT_OUTPUT_DIR, load_events, event_returns, unconditional_returns
 
-# Fetch all available SPX historical data
-spx = yf.download("^GSPC", start="1900-01-01", end="2024-07-01")
+# Extended dates of the first Fed rate cuts (stored/built-in event list)
+rate_cut_dates = load_events('first_rate_cuts')
 
-# Convert rate cut dates to datetime
-rate_cut_dates = [datetime.strptime(date, "%Y-%m-%d") for date in rate_cut_dates]
+# Fetch all available SPX historical data from the shared price store
+spx = load_close("^GSPC")
 
-# Calculate returns after rate cuts
-returns = {"Date": [], "3 Months": [], "6 Months": [], "12 Months": []}
-
-def get_nearest_trading_day(date, spx):
-    """Get the nearest trading day for a given date."""
-    while date not in spx.index:
-        date += timedelta(days=1)
-    return date
-
-for cut_date in rate_cut_dates:
-    returns["Date"].append(cut_date)
-    for period in ["3 Months", "6 Months", "12 Months"]:
-        end_date = cut_date + timedelta(days=90 if period == "3 Months" else 180 if period == "6 Months" else 365)
-        end_date = get_nearest_trading_day(end_date, spx)
-        if end_date in spx.index:
-            start_price = spx.loc[cut_date, "Adj Close"]
-            end_price = spx.loc[end_date, "Adj Close"]
-            returns[period].append((end_price - start_price) / start_price)
-        else:
-            returns[period].append(None)
+# Calculate returns after rate cuts: 90/180/365 calendar days, aligned to the next trading day
+periods = {"3 Months": 90, "6 Months": 180, "12 Months": 365}
+returns = event_returns(spx, rate_cut_dates, list(periods.values()), unit='days') / 100
+returns.columns = list(periods)
 
 # Create a DataFrame to display the results
-results_df = pd.DataFrame(returns)
+results_df = returns.rename_axis("Date").reset_index()
 
 # Calculate averages
-average_3_months = results_df["3 Months"].mean()
-average_6_months = results_df["6 Months"].mean()
-average_12_months = results_df["12 Months"].mean()
-
-# Calculate SPX average returns for comparison
-spx['Returns'] = spx['Adj Close'].pct_change()
-
-def calculate_rolling_return(spx, days):
-    return spx['Adj Close'].pct_change(periods=days).mean()
+averages = returns.mean()
 
-spx_avg_3_months = calculate_rolling_return(spx, 90)
-spx_avg_6_months = calculate_rolling_return(spx, 180)
-spx_avg_12_months = calculate_rolling_return(spx, 365)
+# SPX average returns over the same calendar horizons from every trading day, for comparison
+spx_averages = unconditional_returns(spx, list(periods.values()), unit='days') / 100
 
 # Format results as percentages
-averages = {
-    "Date": ["Average"],
-    "3 Months": [f"{average_3_months * 100:.2f}% (SPX Avg: {spx_avg_3_months * 100:.2f}%)"],
-    "6 Months": [f"{average_6_months * 100:.2f}% (SPX Avg: {spx_avg_6_months * 100:.2f}%)"],
-    "12 Months": [f"{average_12_months * 100:.2f}% (SPX Avg: {spx_avg_12_months * 100:.2f}%)"],
-}
+averages_df = pd.DataFrame({"Date": ["Average"]})
+for period, days in periods.items():
+    averages_df[period] = [f"{averages[period] * 100:.2f}% (SPX Avg: {spx_averages[days] * 100:.2f}%)"]
 
 # Append averages to the DataFrame
-averages_df = pd.DataFrame(averages)
-results_df = pd.concat([results_df, averages_df], ignore_index=True)
+results_df = pd.concat([results_df.astype({p: object for p in periods}), averages_df], ignore_index=True)
 
 # Print the DataFrame
 print(results_df)
 
-# Save the DataFrame to a CSV file
-results_df.to_csv("spx_returns_after_rate_cuts.csv", index=False)
+# Save the DataFrame to a CSV file next to the other event studies
+os.makedirs(DEFAULT_OUTPUT_DIR, exist_ok=True)
+results_df.to_csv(os.path.join(DEFAULT_OUTPUT_DIR, "spx_returns_after_rate_cuts.csv"), index=False)
@@ -1,8 +1,13 @@
-import yfinance as yf
+import os
+import sys
 import matplotlib.pyplot as plt
 import pandas as pd
 from matplotlib.gridspec import GridSpec
 
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Seasonality'))
+from seasonality_cube import load_cube, select_years
+from calendar_cycles import year_list_cycle, cycle_signals, backtest_signals
+
 # Define the periods based on the image, excluding 'A' years
 periods = {
     'B': [1935, 1945, 1953, 1962, 1972, 1980, 1989, 1999, 2007, 2016, 2026, 2034, 2043, 2053],
@@ -11,32 +16,16 @@ periods = {
 
 # Function to calculate returns for both strategies
 def calculate_returns(return_type):
-    # Fetch historical SPX data from Yahoo Finance starting from 1920
-    spx = yf.download('^GSPC', start='1920-01-01')
-    
-    # Add signal column based on periods
-    spx['Signal'] = 0
-    for year in periods['B']:
-        spx.loc[spx.index.year == year, 'Signal'] = -1  # B: Sell years
-    for year in periods['C']:
-        spx.loc[spx.index.year == year, 'Signal'] = 1  # C: Buy years
+    # Historical SPX data starting from 1920, from the cached seasonality cube
+    cube = select_years(load_cube('^GSPC'), 1920)
+    spx = cube[['close']].rename(columns={'close': 'Close'})
 
-    # Backtesting the strategy based on signals
-    initial_investment = 1
-    cash = initial_investment
-    position = 0
-    portfolio_value_signal = []
+    # Signal column from the year lists: B years sell (-1), C years buy (+1)
+    spx['Signal'] = cycle_signals(cube, {'B': -1, 'C': 1}, year_list_cycle(periods))
 
-    for date, row in spx.iterrows():
-        if row['Signal'] == 1 and cash > 0:  # Buy signal
-            position = cash / row['Close']
-            cash = 0
-        elif row['Signal'] == -1 and position > 0:  # Sell signal
-            cash = position * row['Close']
-            position = 0
-        portfolio_value_signal.append(cash if cash > 0 else position * row['Close'])
-
-    spx['Portfolio Value Signal'] = portfolio_value_signal
+    # Backtesting the strategy based on signals, with array-based position accounting
+    initial_investment = 1
+    spx['Portfolio Value Signal'] = initial_investment * backtest_signals(spx['Close'], spx['Signal'])
 
     if return_type == 'percent':
         # Convert portfolio values to percentage returns
@@ -4,6 +4,8 @@ import yfinance as yf
 import datetime
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
+from option_surface import build_surface, plot_option_surface
+from options_analytics import normalize_chain
 
 def options_chain(symbol):
     tk = yf.Ticker(symbol)
@@ -27,11 +29,8 @@ def options_chain(symbol):
         opt_combined['expirationDate'] = e
         options = pd.concat([options, opt_combined], ignore_index=True)
 
-    options['expirationDate'] = pd.to_datetime(options['expirationDate']) + datetime.timedelta(days=1)
+    options = normalize_chain(options, fill_missing=True)
     options['dte'] = (options['expirationDate'] - datetime.datetime.today()).dt.days
-    options['CALL'] = options['contractSymbol'].str[4:].apply(lambda x: "C" in x)
-    options[['bid', 'ask', 'strike', 'volume']] = options[['bid', 'ask', 'strike', 'volume']].apply(pd.to_numeric)
-    options = options.drop(columns=['contractSize', 'currency', 'change', 'percentChange', 'lastTradeDate', 'lastPrice'])
 
     return options, current_price
 
@@ -40,34 +39,12 @@ option_type = input("Display volume for Calls, Puts or Both? (Enter 'Call', 'Put
 options_data, current_price = options_chain(symbol)
 
 if current_price is not None:
-    # Aggregate volume data
-    volume_data = options_data.groupby(['strike', 'dte'])['volume'].sum().reset_index()
-
-    # Filter based on option type
-    if option_type == 'Call':
-        volume_data = options_data[options_data['CALL'] == True].groupby(['strike', 'dte'])['volume'].sum().reset_index()
-    elif option_type == 'Put':
-        volume_data = options_data[options_data['CALL'] == False].groupby(['strike', 'dte'])['volume'].sum().reset_index()
-    else:
-        volume_data = options_data.groupby(['strike', 'dte'])['volume'].sum().reset_index()
-
-    # Prepare data for plotting
-    strikes = volume_data['strike']
-    days_to_expiration = volume_data['dte']
-    volumes = volume_data['volume']
+    # Bin the chain onto a regular moneyness x DTE grid instead of triangulating every contract
+    moneyness, dte, grid = build_surface(options_data, 'volume', spot=current_price, option_type=option_type)
 
     # Create the 3D plot
-    fig = plt.figure()
-    ax = fig.add_subplot(111, projection='3d')
-
-    # Plot the surface
-    surf = ax.plot_trisurf(days_to_expiration, strikes, volumes, cmap='viridis', edgecolor='none')
-
-    # Add labels
-    ax.set_xlabel('Days to Expiration (DTE)')
-    ax.set_ylabel('Strike Price')
-    ax.set_zlabel('Volume')
-    ax.set_title(f'Volume Surface for {symbol}')
+    ax = plot_option_surface(moneyness, dte, grid, current_price, f'Volume Surface for {symbol}', 'Volume')
+    fig = ax.figure
 
     # Add watermark
     fig.text(0.5, 0.5, '@o5341V', fontsize=50, color='gray', ha='center', va='center', alpha=0.5, rotation=30)
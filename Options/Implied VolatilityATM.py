@@ -36,7 +36,7 @@ def fetch_atm_iv_data(symbol):
             iv_data.append({
                 'Date': exp,
                 'IV': row['impliedVolatility'] * 100,
-                'Type': 'Call' if 'C' in row['contractSymbol'] else 'Put'
+                'Type': 'Call' if row['contractSymbol'][-9] == 'C' else 'Put'
             })
 
     return pd.DataFrame(iv_data)
@@ -3,6 +3,7 @@ import numpy as np
 import yfinance as yf
 import datetime
 import matplotlib.pyplot as plt
+from options_analytics import normalize_chain
 
 def options_chain(symbol):
     tk = yf.Ticker(symbol)
@@ -26,11 +27,8 @@ def options_chain(symbol):
         opt_combined['expirationDate'] = e
         options = pd.concat([options, opt_combined], ignore_index=True)
 
-    options['expirationDate'] = pd.to_datetime(options['expirationDate']) + datetime.timedelta(days=1)
+    options = normalize_chain(options, fill_missing=True)
     options['dte'] = (options['expirationDate'] - datetime.datetime.today()).dt.days / 365
-    options['CALL'] = options['contractSymbol'].str[4:].apply(lambda x: "C" in x)
-    options[['bid', 'ask', 'strike', 'openInterest']] = options[['bid', 'ask', 'strike', 'openInterest']].apply(pd.to_numeric)
-    options = options.drop(columns=['contractSize', 'currency', 'change', 'percentChange', 'lastTradeDate', 'lastPrice'])
 
     return options, current_price
 
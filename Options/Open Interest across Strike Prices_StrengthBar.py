@@ -4,6 +4,7 @@ import yfinance as yf
 import datetime
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
+from options_analytics import normalize_chain
 
 def get_last_trading_day():
     today = datetime.datetime.now()
@@ -36,11 +37,8 @@ def options_chain(symbol, as_of_date):
         opt_combined['expirationDate'] = e
         options = pd.concat([options, opt_combined], ignore_index=True)
 
-    options['expirationDate'] = pd.to_datetime(options['expirationDate']) + datetime.timedelta(days=1)
+    options = normalize_chain(options, fill_missing=True)
     options['dte'] = (options['expirationDate'] - pd.to_datetime(as_of_date)).dt.days / 365
-    options['CALL'] = options['contractSymbol'].str[4:].apply(lambda x: "C" in x)
-    options[['bid', 'ask', 'strike', 'openInterest']] = options[['bid', 'ask', 'strike', 'openInterest']].apply(pd.to_numeric)
-    options = options.drop(columns=['contractSize', 'currency', 'change', 'percentChange', 'lastTradeDate', 'lastPrice'])
 
     return options, current_price
 
@@ -3,7 +3,7 @@ import numpy as np
 import yfinance as yf
 import datetime
 import matplotlib.pyplot as plt
-import os
+from options_analytics import normalize_chain, save_chain_snapshot
 
 def options_chain(symbol):
     tk = yf.Ticker(symbol)
@@ -27,20 +27,16 @@ def options_chain(symbol):
         opt_combined['expirationDate'] = e
         options = pd.concat([options, opt_combined], ignore_index=True)
 
-    options['expirationDate'] = pd.to_datetime(options['expirationDate']) + datetime.timedelta(days=1)
-    options['dte'] = (options['expirationDate'] - datetime.datetime.today()).dt.days / 365
-    options['CALL'] = options['contractSymbol'].str[4:].apply(lambda x: "C" in x)
-    options[['bid', 'ask', 'strike', 'openInterest']] = options[['bid', 'ask', 'strike', 'openInterest']].apply(pd.to_numeric)
     options['date_collected'] = datetime.datetime.now()  # Track when data was collected
+    options['underlyingPrice'] = current_price  # Needed to rebuild moneyness surfaces from history
+    options = normalize_chain(options, fill_missing=True)
+    options['dte'] = (options['expirationDate'] - datetime.datetime.today()).dt.days / 365
     return options, current_price
 
 def store_data(options_data, symbol):
-    directory = "/Users/seana/OneDrive/Desktop/Tracking_OI"  # Specify your directory path here
-    filename = f"{directory}/{symbol}_options_data.csv"
-    if os.path.exists(filename):
-        options_data.to_csv(filename, mode='a', header=False, index=False)
-    else:
-        options_data.to_csv(filename, mode='w', header=True, index=False)
+    # One partition per collection day in the snapshot store; oi_history.py diffs consecutive days
+    filename = save_chain_snapshot(options_data, symbol)
+    print(f"Snapshot saved to {filename}")
 
 # Example of how to call the function
 symbol = input("Enter the stock symbol: ")
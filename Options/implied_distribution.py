@@ -0,0 +1,162 @@
+import datetime
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from scipy.stats import norm
+from scipy.ndimage import gaussian_filter1d
+from scipy.integrate import trapezoid
+from options_analytics import fetch_chain
+
+
+def batched_interp(x, xp, fp):
+    """
+    Row-wise np.interp for 2-D inputs: x is (rows, n), xp/fp are (rows, m) with NaN padding.
+
+    Rows are offset so that all of them live in one increasing array, which lets a single
+    np.interp call handle every row; values outside a row's points are clamped to its ends.
+    """
+    valid = ~np.isnan(xp)
+    lo = np.where(valid, xp, np.inf).min(axis=1)
+    hi = np.where(valid, xp, -np.inf).max(axis=1)
+    span = np.nanmax(hi - lo) + 1.0
+    offset = np.arange(len(xp))[:, None] * span * 2
+    x_flat = (np.clip(x, lo[:, None], hi[:, None]) - lo[:, None] + offset).ravel()
+    xp_flat = (xp - lo[:, None] + offset)[valid]
+    return np.interp(x_flat, xp_flat, fp[valid]).reshape(x.shape)
+
+
+def otm_smiles(options_data, spot, as_of=None, min_points=3):
+    """
+    Out-of-the-money IV smile per expiry as padded (expiries x points) log-moneyness/IV arrays.
+
+    Puts are used below spot and calls above, which is where quotes are most reliable.
+    """
+    as_of = pd.Timestamp(as_of if as_of is not None else datetime.date.today())
+    chain = options_data[['expirationDate', 'strike', 'CALL', 'impliedVolatility']].dropna()
+    chain = chain[(chain['impliedVolatility'] > 0.001) & (chain['CALL'] == (chain['strike'] >= spot))]
+    chain = chain[chain['expirationDate'] > as_of]
+    chain = chain.sort_values(['expirationDate', 'strike'])
+    counts = chain.groupby('expirationDate')['strike'].transform('size')
+    chain = chain[counts >= min_points]
+
+    codes, expirations = pd.factorize(chain['expirationDate'], sort=True)
+    pos = chain.groupby('expirationDate').cumcount().to_numpy()
+    shape = (len(expirations), pos.max() + 1 if len(pos) else 0)
+    k = np.full(shape, np.nan)
+    iv = np.full(shape, np.nan)
+    k[codes, pos] = np.log(chain['strike'].to_numpy(dtype=float) / spot)
+    iv[codes, pos] = chain['impliedVolatility'].to_numpy(dtype=float)
+    T = np.maximum((pd.DatetimeIndex(expirations) - as_of).days.to_numpy(), 0.5) / 365
+    return pd.DatetimeIndex(expirations, name='expirationDate'), T, k, iv
+
+
+def implied_distributions(options_data, spot, as_of=None, rate=0.0, grid_points=401, width=5.0, smooth=2.0):
+    """
+    Breeden-Litzenberger risk-neutral density for every expiry in one set of array operations.
+
+    Each expiry's OTM smile is interpolated onto a uniform strike grid spanning +/- width ATM
+    standard deviations, repriced as calls with Black-Scholes (giving a smooth, arbitrage-aware
+    call curve) and differentiated twice: q(K) = exp(rT) * d2C/dK2.
+
+    Returns (expirations, T, strikes, density) with strikes/density shaped (expiries, grid_points).
+    """
+    expirations, T, k, iv = otm_smiles(options_data, spot, as_of)
+    if len(expirations) == 0:
+        return expirations, T, np.empty((0, grid_points)), np.empty((0, grid_points))
+
+    atm_vol = batched_interp(np.zeros((len(T), 1)), k, iv)[:, 0]
+    sd = atm_vol * np.sqrt(T)
+    lo = spot * np.exp(-width * sd)
+    hi = spot * np.exp(width * sd)
+    u = np.linspace(0, 1, grid_points)
+    strikes = lo[:, None] + (hi - lo)[:, None] * u
+    dK = (hi - lo) / (grid_points - 1)
+
+    vol = batched_interp(np.log(strikes / spot), k, iv)
+    if smooth > 0:
+        vol = gaussian_filter1d(vol, smooth, axis=1, mode='nearest')
+    Tc = T[:, None]
+    d1 = (np.log(spot / strikes) + (rate + 0.5 * vol ** 2) * Tc) / (vol * np.sqrt(Tc))
+    d2 = d1 - vol * np.sqrt(Tc)
+    calls = spot * norm.cdf(d1) - strikes * np.exp(-rate * Tc) * norm.cdf(d2)
+
+    density = np.zeros_like(calls)
+    density[:, 1:-1] = np.exp(rate * Tc) * (calls[:, 2:] - 2 * calls[:, 1:-1] + calls[:, :-2]) / dK[:, None] ** 2
+    density = np.clip(density, 0, None)
+    density /= trapezoid(density, strikes, axis=1)[:, None]
+    return expirations, T, strikes, density
+
+
+def distribution_summary(options_data, spot, levels=(), as_of=None, rate=0.0, **kwargs):
+    """
+    Expected-move table per expiry from the implied densities.
+
+    Columns: dte, mean, stdMove, expectedMove (E|S_T - spot|, what an ATM straddle prices),
+    expectedMovePct, probAbove (P[S_T > spot]), skew, kurtosis (excess) and one
+    'P>level' column per requested level. Empty when no expiry has enough OTM quotes.
+    """
+    expirations, T, strikes, q = implied_distributions(options_data, spot, as_of, rate, **kwargs)
+    if len(expirations) == 0:
+        columns = ['dte', 'mean', 'stdMove', 'expectedMove', 'expectedMovePct', 'probAbove', 'skew', 'kurtosis']
+        return pd.DataFrame(columns=columns + [f'P>{level:g}' for level in levels], index=expirations)
+    mean = trapezoid(strikes * q, strikes, axis=1)
+    dev = strikes - mean[:, None]
+    var = trapezoid(dev ** 2 * q, strikes, axis=1)
+    std = np.sqrt(var)
+    skew = trapezoid(dev ** 3 * q, strikes, axis=1) / std ** 3
+    kurt = trapezoid(dev ** 4 * q, strikes, axis=1) / var ** 2 - 3
+    move = trapezoid(np.abs(strikes - spot) * q, strikes, axis=1)
+
+    # CDF by cumulative trapezoid, then P(S_T > level) for every expiry/level at once
+    steps = 0.5 * (q[:, 1:] + q[:, :-1]) * np.diff(strikes, axis=1)
+    cdf = np.concatenate([np.zeros((len(q), 1)), np.cumsum(steps, axis=1)], axis=1)
+    targets = np.array([spot, *levels], dtype=float)
+    above = 1 - batched_interp(np.broadcast_to(targets, (len(q), len(targets))).copy(), strikes, cdf)
+
+    summary = pd.DataFrame({
+        'dte': np.round(T * 365).astype(int),
+        'mean': mean,
+        'stdMove': std,
+        'expectedMove': move,
+        'expectedMovePct': move / spot * 100,
+        'probAbove': above[:, 0],
+        'skew': skew,
+        'kurtosis': kurt,
+    }, index=expirations)
+    for j, level in enumerate(levels, start=1):
+        summary[f'P>{level:g}'] = above[:, j]
+    return summary
+
+
+def plot_densities(expirations, strikes, density, symbol, spot, count=4):
+    """Overlay the implied densities of the first few expiries."""
+    plt.figure(figsize=(10, 5))
+    for i in range(min(count, len(expirations))):
+        plt.plot(strikes[i], density[i], label=str(expirations[i].date()))
+    plt.axvline(x=spot, color='green', linestyle='dashed', linewidth=1, label='Current Price')
+    plt.title(f'Risk-Neutral Implied Distribution for {symbol}')
+    plt.xlabel('Price at Expiration')
+    plt.ylabel('Density')
+    plt.legend()
+    plt.grid(True)
+    plt.show()
+
+
+def main():
+    symbols = [s.strip().upper() for s in input("Enter symbols separated by commas (e.g., SPY, QQQ, AAPL): ").split(',') if s.strip()]
+    levels = input("Enter price levels for probabilities (comma separated, blank for none): ").strip()
+    levels = [float(x) for x in levels.split(',')] if levels else []
+
+    for symbol in symbols:
+        chain, spot = fetch_chain(symbol)
+        summary = distribution_summary(chain, spot, levels)
+        print(f"\n{symbol} (spot {spot:.2f})")
+        print(summary.round(3).to_string() if not summary.empty else "No expiry with enough OTM quotes.")
+
+    if len(symbols) == 1:
+        expirations, T, strikes, density = implied_distributions(chain, spot)
+        plot_densities(expirations, strikes, density, symbols[0], spot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from options_analytics import snapshot_dates, load_chain_snapshot, save_chain_snapshot
+
+SNAPSHOT_COLUMNS = ['contractSymbol', 'expirationDate', 'strike', 'CALL', 'openInterest', 'volume', 'impliedVolatility']
+
+
+def import_legacy_csv(csv_file, symbol):
+    """Split an appended Tracking_OI CSV into one snapshot-store partition per collection day."""
+    legacy = pd.read_csv(csv_file, parse_dates=['expirationDate', 'date_collected'])
+    for day, snapshot in legacy.groupby(legacy['date_collected'].dt.normalize()):
+        # Keep the last pull of each day, like a fresh Tracking_OI run would
+        last_pull = snapshot[snapshot['date_collected'] == snapshot['date_collected'].max()]
+        save_chain_snapshot(last_pull, symbol, day)
+
+
+def _load_indexed(symbol, as_of):
+    snapshot = load_chain_snapshot(symbol, as_of, columns=SNAPSHOT_COLUMNS)
+    return snapshot.drop_duplicates('contractSymbol', keep='last').set_index('contractSymbol')
+
+
+def oi_changes(symbol, start=None, end=None, lookback=20, z_threshold=3.0, min_history=5):
+    """
+    Day-over-day open interest, volume and IV changes between consecutive stored snapshots.
+
+    Only the partitions in [start, end] plus `lookback` earlier ones (used to warm up each
+    contract's ΔOI history) are read, two at a time. Per-contract ΔOI mean/variance are kept
+    as running (Welford) statistics so months of full-chain snapshots never sit in memory at once.
+
+    Returns (by_strike, by_expiry, unusual):
+      by_strike  - ΔOI/Δvolume sums and mean ΔIV per date, strike and side
+      by_expiry  - the same aggregated per date and expiration
+      unusual    - contracts whose ΔOI z-score against their own history exceeds z_threshold
+    """
+    all_dates = snapshot_dates(symbol, end=end)
+    first = 0
+    if start is not None:
+        first = max(0, int(np.searchsorted(pd.DatetimeIndex(all_dates), pd.Timestamp(start))) - lookback - 1)
+    dates = all_dates[first:]
+    if len(dates) < 2:
+        print(f"Need at least two stored snapshots for {symbol} to compute changes.")
+        return None, None, None
+
+    stats = pd.DataFrame(columns=['n', 'mean', 'm2'], dtype=float)
+    by_strike, by_expiry, unusual = [], [], []
+    previous = _load_indexed(symbol, dates[0])
+    for date in dates[1:]:
+        current = _load_indexed(symbol, date)
+        joined = current.join(previous[['openInterest', 'volume', 'impliedVolatility']], how='inner', rsuffix='_prev')
+        changes = pd.DataFrame({
+            'date': date,
+            'expirationDate': joined['expirationDate'],
+            'strike': joined['strike'],
+            'CALL': joined['CALL'],
+            'dOI': joined['openInterest'] - joined['openInterest_prev'],
+            'dVolume': joined['volume'] - joined['volume_prev'],
+            'dIV': joined['impliedVolatility'] - joined['impliedVolatility_prev'],
+        }, index=joined.index)
+
+        # z-score of today's ΔOI against the contract's own ΔOI history up to yesterday
+        prior = stats.reindex(changes.index)
+        std = np.sqrt(prior['m2'] / (prior['n'] - 1))
+        changes['oiZ'] = ((changes['dOI'] - prior['mean']) / std.replace(0, np.nan)).where(prior['n'] >= min_history)
+
+        # Welford update, keeping only contracts still listed today
+        d_oi = changes['dOI'].dropna()
+        merged = stats.reindex(stats.index.union(d_oi.index)).fillna(0.0)
+        x = d_oi.reindex(merged.index)
+        seen = x.notna()
+        n = merged['n'] + seen
+        delta = (x - merged['mean']).where(seen, 0.0)
+        merged['mean'] = merged['mean'] + (delta / n).where(seen, 0.0)
+        merged['m2'] = merged['m2'] + (delta * (x - merged['mean'])).where(seen, 0.0)
+        merged['n'] = n
+        stats = merged.loc[merged.index.intersection(current.index)]
+
+        previous = current
+        if start is not None and date < pd.Timestamp(start):
+            continue
+        by_strike.append(changes.groupby(['date', 'strike', 'CALL']).agg(dOI=('dOI', 'sum'), dVolume=('dVolume', 'sum'), dIV=('dIV', 'mean')))
+        by_expiry.append(changes.groupby(['date', 'expirationDate']).agg(dOI=('dOI', 'sum'), dVolume=('dVolume', 'sum'), dIV=('dIV', 'mean')))
+        unusual.append(changes[changes['oiZ'].abs() >= z_threshold])
+
+    if not by_strike:
+        print(f"No snapshot pairs for {symbol} in the requested date range.")
+        return None, None, None
+    unusual = pd.concat(unusual).reset_index().sort_values(['date', 'oiZ'], ascending=[True, False], ignore_index=True)
+    return pd.concat(by_strike).reset_index(), pd.concat(by_expiry).reset_index(), unusual
+
+
+def plot_oi_changes(by_strike, symbol):
+    """Bar chart of call and put ΔOI by strike for the latest date in by_strike."""
+    latest = by_strike[by_strike['date'] == by_strike['date'].max()]
+    calls = latest[latest['CALL'] == True]
+    puts = latest[latest['CALL'] == False]
+    plt.figure(figsize=(10, 5))
+    plt.bar(calls['strike'], calls['dOI'], width=1, color='blue', label='Calls', alpha=0.5)
+    plt.bar(puts['strike'], puts['dOI'], width=1, color='red', label='Puts', alpha=0.5)
+    plt.title(f"Day-over-Day Change in Open Interest for {symbol} as of {latest['date'].max().date()}")
+    plt.xlabel('Strike Price')
+    plt.ylabel('Change in Open Interest')
+    plt.legend()
+    plt.grid(True)
+    plt.show()
+
+
+def main():
+    symbol = input("Enter the stock symbol: ").strip().upper()
+    start = input("Enter the start date (YYYY-MM-DD, blank for all history): ").strip() or None
+    end = input("Enter the end date (YYYY-MM-DD, blank for latest): ").strip() or None
+
+    by_strike, by_expiry, unusual = oi_changes(symbol, start, end)
+    if by_strike is None:
+        return
+    print(by_expiry[by_expiry['date'] == by_expiry['date'].max()].to_string(index=False))
+    # unusual is sorted by oiZ descending within each date, so head() holds the strongest builds
+    latest = unusual[unusual['date'] == unusual['date'].max()]
+    if len(latest):
+        print(f"\nUnusual OI builds on {latest['date'].max().date()}:")
+        print(latest.head(20).to_string(index=False))
+    else:
+        print("\nNo unusual OI builds in the requested range.")
+    plot_oi_changes(by_strike, symbol)
+
+
+if __name__ == "__main__":
+    main()
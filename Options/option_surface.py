@@ -0,0 +1,164 @@
+import os
+import sys
+import datetime
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from matplotlib.animation import FuncAnimation
+from scipy.ndimage import gaussian_filter
+from options_analytics import snapshot_dates, load_chain_snapshot
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from price_store import load_close
+
+
+def build_surface(options_data, value='openInterest', spot=None, as_of=None, option_type='Both',
+                  moneyness_range=None, moneyness_bins=40, max_dte=None, dte_bins=30,
+                  agg='sum', smooth=0.0):
+    """
+    Bin a chain onto a regular strike-moneyness x DTE grid.
+
+    Every contract is assigned to a (moneyness, dte) cell with np.digitize and the cells are
+    filled with one np.bincount, so the cost is linear in the chain size and the result is a
+    dense grid that plot_surface can draw directly. moneyness_range and max_dte default to the
+    chain's full range, so LEAPS and far strikes are kept; both ends of the range are included.
+    agg is 'sum' or 'mean'; smooth is the Gaussian sigma in cells (0 disables smoothing).
+
+    Returns (moneyness_centers, dte_centers, grid) with grid shaped (dte_bins, moneyness_bins).
+    """
+    if spot is None:
+        spot = options_data['underlyingPrice'].iloc[0]
+    as_of = pd.Timestamp(as_of if as_of is not None else datetime.date.today())
+
+    if option_type == 'Call':
+        options_data = options_data[options_data['CALL'] == True]
+    elif option_type == 'Put':
+        options_data = options_data[options_data['CALL'] == False]
+
+    moneyness = options_data['strike'].to_numpy(dtype=float) / spot
+    dte = (pd.to_datetime(options_data['expirationDate']) - as_of).dt.days.to_numpy()
+    values = options_data[value].fillna(0).to_numpy(dtype=float)
+    if moneyness_range is None:
+        moneyness_range = (moneyness.min(), moneyness.max()) if len(moneyness) else (1.0, 1.0)
+    if max_dte is None:
+        max_dte = max(dte.max(), 1) if len(dte) else 1
+
+    m_edges = np.linspace(moneyness_range[0], moneyness_range[1], moneyness_bins + 1)
+    d_edges = np.linspace(0, max_dte, dte_bins + 1)
+    m_idx = np.where(moneyness == m_edges[-1], moneyness_bins, np.digitize(moneyness, m_edges)) - 1
+    d_idx = np.where(dte == d_edges[-1], dte_bins, np.digitize(dte, d_edges)) - 1
+    inside = (m_idx >= 0) & (m_idx < moneyness_bins) & (d_idx >= 0) & (d_idx < dte_bins)
+    cell = d_idx[inside] * moneyness_bins + m_idx[inside]
+
+    size = dte_bins * moneyness_bins
+    grid = np.bincount(cell, weights=values[inside], minlength=size)
+    if agg == 'mean':
+        counts = np.bincount(cell, minlength=size)
+        grid = np.divide(grid, counts, out=np.zeros(size), where=counts > 0)
+    elif agg != 'sum':
+        raise ValueError("agg must be 'sum' or 'mean'.")
+    grid = grid.reshape(dte_bins, moneyness_bins)
+
+    if smooth > 0:
+        grid = gaussian_filter(grid, sigma=smooth, mode='nearest')
+
+    return (m_edges[:-1] + m_edges[1:]) / 2, (d_edges[:-1] + d_edges[1:]) / 2, grid
+
+
+def surface_frame(moneyness, dte, grid):
+    """Tidy (dte, moneyness, value) frame of a surface grid."""
+    mm, dd = np.meshgrid(moneyness, dte)
+    return pd.DataFrame({'dte': dd.ravel(), 'moneyness': mm.ravel(), 'value': grid.ravel()})
+
+
+def export_surface(moneyness, dte, grid, path):
+    """Save a surface as .npz (axes + grid) or as a tidy Parquet/CSV table, chosen by file extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.npz':
+        np.savez_compressed(path, moneyness=moneyness, dte=dte, grid=grid)
+    elif extension == '.parquet':
+        surface_frame(moneyness, dte, grid).to_parquet(path, index=False)
+    elif extension == '.csv':
+        surface_frame(moneyness, dte, grid).to_csv(path, index=False)
+    else:
+        raise ValueError(f"Unsupported surface export format: {extension}")
+
+
+def plot_option_surface(moneyness, dte, grid, spot, title, zlabel, ax=None):
+    """Draw a gridded surface with DTE on x and strike price on y."""
+    if ax is None:
+        fig = plt.figure()
+        ax = fig.add_subplot(111, projection='3d')
+    dd, kk = np.meshgrid(dte, moneyness * spot, indexing='ij')
+    ax.plot_surface(dd, kk, grid, cmap='viridis', edgecolor='none')
+    ax.set_xlabel('Days to Expiration (DTE)')
+    ax.set_ylabel('Strike Price')
+    ax.set_zlabel(zlabel)
+    ax.set_title(title)
+    return ax
+
+
+def animate_snapshots(symbol, value='openInterest', start=None, end=None, interval=500, offline_mode=False,
+                      **grid_kwargs):
+    """
+    Animate the surface across the days stored in the snapshot store.
+
+    Every frame uses the same grid so days are directly comparable: unless moneyness_range and
+    max_dte are given, they span all snapshots together. Each snapshot is binned against its own
+    collection date and underlying price; snapshots stored without underlyingPrice use that
+    day's close from the price store, and days without a spot or without the value are skipped.
+    """
+    dates = snapshot_dates(symbol, start, end)
+    if not dates:
+        print(f"No stored snapshots for {symbol} in the requested range.")
+        return None
+    columns = ['strike', 'expirationDate', 'CALL', 'underlyingPrice', value]
+    closes = None
+    snapshots = []
+    for d in dates:
+        chain = load_chain_snapshot(symbol, d, columns=columns)
+        if value not in chain.columns:
+            print(f"Skipping {d.date()}: snapshot has no {value}.")
+            continue
+        if 'underlyingPrice' in chain.columns and chain['underlyingPrice'].notna().any():
+            spot = chain['underlyingPrice'].dropna().iloc[0]
+        else:
+            if closes is None:
+                closes = load_close(symbol, column='Close', offline_mode=offline_mode)
+            known = closes[closes.index <= d]
+            if known.empty:
+                print(f"Skipping {d.date()}: no underlying price for {symbol}.")
+                continue
+            spot = known.iloc[-1]
+        snapshots.append((d, chain, spot))
+    if not snapshots:
+        print(f"No usable snapshots for {symbol} in the requested range.")
+        return None
+
+    if grid_kwargs.get('moneyness_range') is None:
+        moneyness = np.concatenate([chain['strike'].to_numpy(dtype=float) / spot for _, chain, spot in snapshots])
+        grid_kwargs['moneyness_range'] = (moneyness.min(), moneyness.max())
+    if grid_kwargs.get('max_dte') is None:
+        grid_kwargs['max_dte'] = max(max((pd.to_datetime(chain['expirationDate']) - d).dt.days.max(), 1)
+                                     for d, chain, _ in snapshots)
+    surfaces = [build_surface(chain, value, spot=spot, as_of=d, **grid_kwargs) for d, chain, spot in snapshots]
+    dates = [d for d, _, _ in snapshots]
+    z_max = max(grid.max() for _, _, grid in surfaces)
+
+    fig = plt.figure()
+    ax = fig.add_subplot(111, projection='3d')
+
+    def draw(i):
+        ax.clear()
+        moneyness, dte, grid = surfaces[i]
+        dd, mm = np.meshgrid(dte, moneyness, indexing='ij')
+        ax.plot_surface(dd, mm, grid, cmap='viridis', edgecolor='none', vmin=0, vmax=z_max)
+        ax.set_zlim(0, z_max)
+        ax.set_xlabel('Days to Expiration (DTE)')
+        ax.set_ylabel('Moneyness (Strike / Spot)')
+        ax.set_zlabel(value)
+        ax.set_title(f'{value} Surface for {symbol} on {dates[i].date()}')
+
+    animation = FuncAnimation(fig, draw, frames=len(surfaces), interval=interval)
+    plt.show()
+    return animation
@@ -0,0 +1,284 @@
+import os
+import datetime
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import yfinance as yf
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".options_cache")
+
+# OCC symbols end in YYMMDD + C/P + 8-digit strike in thousandths, e.g. SPXW241115C05800000
+STRIKE_SCALE = 1000
+CHAIN_COLUMNS = ['contractSymbol', 'bid', 'ask', 'lastPrice', 'volume', 'openInterest', 'impliedVolatility',
+                 'underlyingPrice', 'date_collected']
+
+
+def parse_occ_symbols(symbols):
+    """
+    Split OCC option symbols into root, expiration date, type and scaled strike.
+
+    The fixed-width tail is sliced from the right with vectorized string ops, so roots of any
+    length (SPY, SPXW, BRKB...) parse correctly regardless of which letters they contain.
+    Unparseable symbols come back with missing fields.
+    """
+    symbols = pd.Series(symbols).astype('string')
+    strike_code = pd.to_numeric(symbols.str[-8:], errors='coerce')
+    return pd.DataFrame({
+        'root': symbols.str[:-15].astype('category'),
+        'expirationDate': pd.to_datetime(symbols.str[-15:-9], format='%y%m%d', errors='coerce'),
+        'type': pd.Categorical(symbols.str[-9], categories=['C', 'P']),
+        'strikeCode': strike_code.astype('Int32'),
+    }, index=symbols.index)
+
+
+def normalize_chain(options, fill_missing=False):
+    """
+    Compact, typed option chain built from a raw yfinance chain.
+
+    Unused columns are dropped before any conversion; root and type are categoricals,
+    expirationDate/type/strike come from the OCC symbol, open interest and volume are
+    nullable Int32 (or 0-filled with fill_missing=True) and prices/IV are float32. strike stays
+    a float64 price in memory, since every tool compares and plots it as one; only snapshots
+    on disk store it as int32 thousandths (see save_chain_snapshot).
+    """
+    options = options[[c for c in CHAIN_COLUMNS if c in options.columns]]
+    parsed = parse_occ_symbols(options['contractSymbol'])
+    valid = parsed['strikeCode'].notna() & parsed['expirationDate'].notna() & parsed['type'].notna()
+    if not valid.all():
+        print(f"Warning: dropped {(~valid).sum()} contracts with unparseable OCC symbols.")
+        options, parsed = options[valid], parsed[valid]
+
+    chain = pd.DataFrame({
+        'contractSymbol': options['contractSymbol'].astype('string'),
+        'root': parsed['root'].cat.remove_unused_categories(),
+        'expirationDate': parsed['expirationDate'],
+        'type': parsed['type'],
+        'CALL': (parsed['type'] == 'C').to_numpy(),
+        'strike': parsed['strikeCode'].to_numpy(dtype='int64') / STRIKE_SCALE,
+    }, index=options.index)
+    for column in ('openInterest', 'volume'):
+        if column in options.columns:
+            values = pd.to_numeric(options[column], errors='coerce')
+            chain[column] = (values.fillna(0) if fill_missing else values).round().astype('Int32')
+    for column in ('bid', 'ask', 'lastPrice', 'impliedVolatility', 'underlyingPrice'):
+        if column in options.columns:
+            chain[column] = pd.to_numeric(options[column], errors='coerce').astype('float32')
+    if 'date_collected' in options.columns:
+        chain['date_collected'] = options['date_collected']
+    return chain.reset_index(drop=True)
+
+
+def monthly_opex_mask(dates):
+    """Vectorized third-Friday check for an array/Series/Index of dates."""
+    dates = pd.DatetimeIndex(dates)
+    # The third Friday always falls on day 15-21 of the month
+    return np.asarray((dates.weekday == 4) & (dates.day >= 15) & (dates.day <= 21))
+
+
+def strike_open_interest(options_data):
+    """Call and put open interest per (expirationDate, strike) as a two-column frame."""
+    by_strike = options_data.groupby(['expirationDate', 'strike', 'CALL'])['openInterest'].sum().unstack('CALL', fill_value=0)
+    return pd.DataFrame({
+        'callOI': by_strike[True] if True in by_strike.columns else 0,
+        'putOI': by_strike[False] if False in by_strike.columns else 0,
+    }, index=by_strike.index)
+
+
+def _padded_strikes(by_strike):
+    """Scatter per-expiration strikes and OI into (expirations x strikes) arrays padded with zero OI."""
+    by_strike = by_strike.reset_index()
+    exp_codes, expirations = pd.factorize(by_strike['expirationDate'], sort=True)
+    pos = by_strike.groupby('expirationDate').cumcount().to_numpy()
+    shape = (len(expirations), pos.max() + 1)
+    strikes = np.full(shape, np.nan)
+    call_oi = np.zeros(shape)
+    put_oi = np.zeros(shape)
+    strikes[exp_codes, pos] = by_strike['strike'].to_numpy()
+    call_oi[exp_codes, pos] = by_strike['callOI'].to_numpy()
+    put_oi[exp_codes, pos] = by_strike['putOI'].to_numpy()
+    return expirations, strikes, call_oi, put_oi
+
+
+def max_pain_by_expiration(options_data, max_cells=4_000_000):
+    """
+    Max-pain strike for every expiration in the chain.
+
+    For each expiration the total holder payout is evaluated at every listed strike as a
+    (strikes x strikes) broadcast; all expirations are stacked into one padded array and
+    processed in chunks of at most max_cells elements to bound memory on index chains.
+    """
+    expirations, strikes, call_oi, put_oi = _padded_strikes(strike_open_interest(options_data))
+    listed = ~np.isnan(strikes)
+    k = np.where(listed, strikes, 0.0)
+    chunk = max(1, max_cells // (k.shape[1] ** 2))
+    max_pain = np.empty(len(expirations))
+    for start in range(0, len(expirations), chunk):
+        sl = slice(start, start + chunk)
+        settle = k[sl, :, None]
+        strike = k[sl, None, :]
+        payout = (np.maximum(settle - strike, 0) * call_oi[sl, None, :]).sum(axis=2) \
+            + (np.maximum(strike - settle, 0) * put_oi[sl, None, :]).sum(axis=2)
+        payout[~listed[sl]] = np.inf
+        max_pain[sl] = np.take_along_axis(k[sl], payout.argmin(axis=1)[:, None], axis=1)[:, 0]
+    return pd.Series(max_pain, index=pd.DatetimeIndex(expirations, name='expirationDate'), name='maxPain')
+
+
+def oi_walls(options_data, top_n=3):
+    """Top-N call and put open interest strikes per expiration as a tidy frame."""
+    by_strike = strike_open_interest(options_data).reset_index()
+    walls = []
+    for side, column in (('C', 'callOI'), ('P', 'putOI')):
+        top = by_strike.sort_values(['expirationDate', column], ascending=[True, False]).groupby('expirationDate').head(top_n)
+        top = top[['expirationDate', 'strike', column]].rename(columns={column: 'openInterest'})
+        top['side'] = side
+        top['rank'] = top.groupby('expirationDate').cumcount() + 1
+        walls.append(top)
+    walls = pd.concat(walls, ignore_index=True)
+    return walls[['expirationDate', 'side', 'rank', 'strike', 'openInterest']].sort_values(['expirationDate', 'side', 'rank'], ignore_index=True)
+
+
+def snapshot_dir(symbol, as_of=None):
+    """Directory holding the chain snapshot and derived tables for a symbol on a given day."""
+    as_of = pd.Timestamp(as_of if as_of is not None else datetime.date.today()).strftime('%Y-%m-%d')
+    return os.path.join(CACHE_DIR, symbol.upper(), as_of)
+
+
+def save_chain_snapshot(options_data, symbol, as_of=None):
+    """Write a chain snapshot to the per-day partition of the snapshot store and return its path."""
+    directory = snapshot_dir(symbol, as_of)
+    os.makedirs(directory, exist_ok=True)
+    chain_file = os.path.join(directory, 'chain.parquet')
+    # Stored strikes are scaled int32 codes; load_chain_snapshot turns them back into prices
+    stored = options_data.drop(columns=['strike'])
+    stored.insert(stored.columns.get_loc('type') + 1 if 'type' in stored.columns else 0, 'strikeCode',
+                  np.round(options_data['strike'].to_numpy(dtype=float) * STRIKE_SCALE).astype('int32'))
+    stored.to_parquet(chain_file, index=False)
+    return chain_file
+
+
+def snapshot_dates(symbol, start=None, end=None):
+    """Sorted dates that have a stored chain snapshot for the symbol, optionally limited to [start, end]."""
+    root = os.path.join(CACHE_DIR, symbol.upper())
+    if not os.path.isdir(root):
+        return []
+    dates = pd.DatetimeIndex(sorted(
+        d for d in os.listdir(root) if os.path.exists(os.path.join(root, d, 'chain.parquet'))
+    ))
+    if start is not None:
+        dates = dates[dates >= pd.Timestamp(start)]
+    if end is not None:
+        dates = dates[dates <= pd.Timestamp(end)]
+    return list(dates)
+
+
+def load_chain_snapshot(symbol, as_of, columns=None):
+    """
+    Read one day's chain snapshot, optionally only the requested columns.
+
+    Partitions written by different tools store different columns (imported legacy CSVs and
+    cached chains have no underlyingPrice, for example), so requested columns the partition
+    does not hold are left out rather than failing the read; callers check for them.
+    """
+    chain_file = os.path.join(snapshot_dir(symbol, as_of), 'chain.parquet')
+    wants_strike = columns is None or 'strike' in columns
+    if columns is not None:
+        stored = set(pq.read_schema(chain_file).names)
+        columns = [c for c in ('strikeCode' if c == 'strike' else c for c in columns) if c in stored]
+    snapshot = pd.read_parquet(chain_file, columns=columns)
+    if wants_strike:
+        snapshot.insert(snapshot.columns.get_loc('strikeCode'), 'strike', snapshot['strikeCode'].to_numpy(dtype=float) / STRIKE_SCALE)
+        snapshot = snapshot.drop(columns=['strikeCode'])
+    return snapshot
+
+
+def cached_chain_levels(options_data, symbol, as_of=None, top_n=3, refresh=False):
+    """
+    Max pain and OI walls for a chain snapshot, cached next to the snapshot itself.
+
+    The chain is written to <CACHE_DIR>/<SYMBOL>/<YYYY-MM-DD>/chain.parquet on first use and the
+    results to max_pain.parquet and walls.parquet in the same folder, so later runs for the same
+    day read the tables back instead of recomputing them.
+    """
+    directory = snapshot_dir(symbol, as_of)
+    chain_file = os.path.join(directory, 'chain.parquet')
+    max_pain_file = os.path.join(directory, 'max_pain.parquet')
+    walls_file = os.path.join(directory, 'walls.parquet')
+
+    if not refresh and os.path.exists(max_pain_file) and os.path.exists(walls_file):
+        walls = pd.read_parquet(walls_file)
+        if walls['rank'].max() >= top_n:
+            return pd.read_parquet(max_pain_file)['maxPain'], walls[walls['rank'] <= top_n].reset_index(drop=True)
+
+    if refresh or not os.path.exists(chain_file):
+        save_chain_snapshot(options_data, symbol, as_of)
+    max_pain = max_pain_by_expiration(options_data)
+    walls = oi_walls(options_data, top_n)
+    max_pain.to_frame().to_parquet(max_pain_file)
+    walls.to_parquet(walls_file, index=False)
+    return max_pain, walls
+
+
+def summarize_expirations(options_data):
+    """
+    Per-expiration open interest summary computed in one grouped pass over the chain.
+
+    Returns a tidy frame with one row per expiration: contracts, callOI, putOI,
+    deltaOI, dominant, monthlyOPEX, putCallRatio and maxPain.
+    """
+    by_type = options_data.groupby(['expirationDate', 'CALL'])['openInterest'].agg(['size', 'sum']).unstack('CALL', fill_value=0)
+    summary = pd.DataFrame({
+        'contracts': by_type['size'].sum(axis=1),
+        'callOI': by_type['sum'][True] if True in by_type['sum'].columns else 0,
+        'putOI': by_type['sum'][False] if False in by_type['sum'].columns else 0,
+    })
+    summary['deltaOI'] = (summary['callOI'] - summary['putOI']).abs()
+    summary['dominant'] = np.where(summary['callOI'] > summary['putOI'], 'C', 'P')
+    summary['monthlyOPEX'] = monthly_opex_mask(summary.index)
+    summary['putCallRatio'] = (summary['putOI'] / summary['callOI']).replace(np.inf, np.nan)
+
+    summary['maxPain'] = max_pain_by_expiration(options_data)
+    return summary.reset_index()
+
+
+def print_expiration_summary(summary):
+    """Print one line per expiration in the format the OI scripts have always used."""
+    for row in summary.itertuples(index=False):
+        opex_label = " (Monthly OPEX)" if row.monthlyOPEX else ""
+        print(f"Expiration Date: {row.expirationDate.date()}{opex_label}, Number of Contracts: {row.contracts}, "
+              f"Calls Open Interest: {row.callOI}, Puts Open Interest: {row.putOI}, Delta: +{row.deltaOI}{row.dominant}, "
+              f"Put/Call Ratio: {row.putCallRatio:.2f}, Max Pain: {row.maxPain}")
+
+
+def fetch_chain(symbol, use_cache=True, throttle=None):
+    """
+    Today's normalized chain and spot price for a symbol.
+
+    Reads today's partition of the snapshot store when it exists; otherwise downloads every
+    expiration once, concatenates them in a single pd.concat and stores the result.
+    throttle, if given, is called before every Yahoo request (see watchlist_batch.RateLimiter).
+    """
+    throttle = throttle or (lambda: None)
+    if use_cache and os.path.exists(os.path.join(snapshot_dir(symbol), 'chain.parquet')):
+        chain = load_chain_snapshot(symbol, None)
+        if 'underlyingPrice' in chain.columns:
+            return chain, float(chain['underlyingPrice'].iloc[0])
+
+    tk = yf.Ticker(symbol)
+    throttle()
+    info = tk.info
+    current_price = info.get('regularMarketPrice', info.get('previousClose'))
+    throttle()
+    exps = tk.options
+    if not exps:
+        raise ValueError("No options data found for this symbol.")
+    frames = []
+    for e in exps:
+        throttle()
+        opt = tk.option_chain(e)
+        frames.extend([opt.calls, opt.puts])
+    options = pd.concat(frames, ignore_index=True)
+    options['underlyingPrice'] = current_price
+    options['date_collected'] = datetime.datetime.now()
+    chain = normalize_chain(options)
+    save_chain_snapshot(chain, symbol)
+    return chain, current_price
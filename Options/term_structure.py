@@ -0,0 +1,132 @@
+import os
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from options_analytics import CACHE_DIR, snapshot_dates, load_chain_snapshot
+from implied_distribution import otm_smiles, batched_interp
+
+TENORS = (7, 30, 60, 90)
+TENOR_BUCKETS = [(0, 7), (8, 30), (31, 60), (61, 90), (91, None)]
+METRIC_COLUMNS = ['expirationDate', 'strike', 'CALL', 'openInterest', 'volume', 'impliedVolatility', 'underlyingPrice']
+
+
+def history_file(symbol):
+    """Parquet file holding the daily put/call and ATM IV series for a symbol."""
+    return os.path.join(CACHE_DIR, symbol.upper(), 'term_structure.parquet')
+
+
+def _bucket_label(low, high):
+    return f'{low}-{high}d' if high is not None else f'{low}d+'
+
+
+def constant_maturity_iv(T, atm_iv, tenors=TENORS):
+    """
+    ATM IV at fixed tenors (days) from the per-expiry ATM IVs.
+
+    Interpolation is linear in total variance (iv^2 * T), which keeps the forward variance
+    between listed expiries positive; tenors outside the listed range take the nearest IV.
+    """
+    if len(T) == 0:
+        return np.full(len(tenors), np.nan)
+    target = np.asarray(tenors, dtype=float) / 365
+    total_var = np.interp(target, T, atm_iv ** 2 * T)
+    iv = np.sqrt(total_var / target)
+    iv[target < T[0]] = atm_iv[0]
+    iv[target > T[-1]] = atm_iv[-1]
+    return iv
+
+
+def daily_metrics(snapshot, as_of, tenors=TENORS):
+    """Put/call OI and volume ratios (total and per DTE bucket) and constant-maturity ATM IV for one snapshot."""
+    as_of = pd.Timestamp(as_of)
+    dte = (pd.to_datetime(snapshot['expirationDate']) - as_of).dt.days.to_numpy()
+    calls = snapshot['CALL'].to_numpy(dtype=bool)
+    oi = snapshot['openInterest'].fillna(0).to_numpy(dtype=float)
+    volume = snapshot['volume'].fillna(0).to_numpy(dtype=float) if 'volume' in snapshot.columns else np.zeros(len(dte))
+
+    row = {'date': as_of}
+    buckets = [('', np.ones(len(dte), dtype=bool))]
+    buckets += [('_' + _bucket_label(low, high), (dte >= low) & ((dte <= high) if high is not None else True))
+                for low, high in TENOR_BUCKETS]
+    for suffix, mask in buckets:
+        for name, values in (('OI', oi), ('Volume', volume)):
+            call_total = values[mask & calls].sum()
+            put_total = values[mask & ~calls].sum()
+            if suffix == '':
+                row[f'call{name}'] = call_total
+                row[f'put{name}'] = put_total
+            row[f'pcr{name}{suffix}'] = put_total / call_total if call_total > 0 else np.nan
+
+    has_smile = {'underlyingPrice', 'impliedVolatility'} <= set(snapshot.columns)
+    spot = snapshot['underlyingPrice'].dropna() if has_smile else pd.Series(dtype=float)
+    atm = np.full(len(tenors), np.nan)
+    if len(spot):
+        expirations, T, k, iv = otm_smiles(snapshot, float(spot.iloc[0]), as_of)
+        if len(expirations):
+            atm = constant_maturity_iv(T, batched_interp(np.zeros((len(T), 1)), k, iv)[:, 0], tenors)
+    else:
+        print(f"Snapshot for {as_of.date()} has no underlyingPrice/IV; ATM IV left empty.")
+    for tenor, value in zip(tenors, atm):
+        row[f'atmIV_{tenor}d'] = value
+    return row
+
+
+def update_term_structure(symbol, tenors=TENORS):
+    """
+    Bring a symbol's stored put/call and ATM IV series up to date with the snapshot store.
+
+    Only snapshot days after the last stored row are read, so a daily run touches one
+    partition no matter how much history has been collected. Returns the full series.
+    """
+    path = history_file(symbol)
+    history = pd.read_parquet(path) if os.path.exists(path) else None
+    start = history['date'].max() + pd.Timedelta(days=1) if history is not None and len(history) else None
+
+    rows = [daily_metrics(load_chain_snapshot(symbol, d, columns=METRIC_COLUMNS), d, tenors)
+            for d in snapshot_dates(symbol, start=start)]
+    if not rows:
+        return history
+
+    new = pd.DataFrame(rows)
+    value_columns = new.columns.drop('date')
+    new[value_columns] = new[value_columns].astype('float32')
+    history = new if history is None else pd.concat([history, new], ignore_index=True)
+    history.to_parquet(path, index=False)
+    return history
+
+
+def plot_term_structure(history, symbol, tenors=TENORS):
+    """Put/call ratios and constant-maturity ATM IV over time."""
+    fig, (ax_pcr, ax_iv) = plt.subplots(2, 1, figsize=(12, 8), sharex=True)
+    ax_pcr.plot(history['date'], history['pcrOI'], label='Put/Call OI')
+    ax_pcr.plot(history['date'], history['pcrVolume'], label='Put/Call Volume')
+    ax_pcr.axhline(y=1, color='gray', linestyle='dashed', linewidth=1)
+    ax_pcr.set_title(f'Put/Call Ratios for {symbol}')
+    ax_pcr.legend()
+    ax_pcr.grid(True)
+    for tenor in tenors:
+        ax_iv.plot(history['date'], history[f'atmIV_{tenor}d'] * 100, label=f'{tenor}D')
+    ax_iv.set_title(f'Constant-Maturity ATM IV for {symbol}')
+    ax_iv.set_ylabel('Implied Volatility (%)')
+    ax_iv.legend()
+    ax_iv.grid(True)
+    plt.tight_layout()
+    plt.show()
+
+
+def main():
+    symbols = [s.strip().upper() for s in input("Enter symbols separated by commas (e.g., SPY, QQQ): ").split(',') if s.strip()]
+    for symbol in symbols:
+        history = update_term_structure(symbol)
+        if history is None:
+            print(f"No stored snapshots for {symbol}.")
+            continue
+        print(f"\n{symbol}")
+        print(history.tail(5).round(3).to_string(index=False))
+
+    if len(symbols) == 1 and history is not None:
+        plot_term_structure(history, symbols[0])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import os
+import sys
+import time
+import argparse
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from options_analytics import fetch_chain, summarize_expirations, strike_open_interest
+from term_structure import daily_metrics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from watchlists import read_watchlist
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.expanduser("~"), "options_dashboard")
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing calls at least 1/rate seconds apart across all threads."""
+
+    def __init__(self, rate=2.0):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+
+    def __call__(self):
+        with self.lock:
+            now = time.monotonic()
+            wait = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+def fetch_watchlist(symbols, workers=8, rate=2.0, use_cache=True):
+    """
+    Fetch every symbol's chain concurrently under one global request rate.
+
+    Returns {symbol: (chain, spot)}; symbols that fail are reported and left out.
+    """
+    throttle = RateLimiter(rate)
+
+    def fetch(symbol):
+        try:
+            return symbol, fetch_chain(symbol, use_cache=use_cache, throttle=throttle)
+        except Exception as e:
+            print(f"Failed to fetch {symbol}: {e}")
+            return symbol, None
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return {symbol: result for symbol, result in pool.map(fetch, symbols) if result is not None}
+
+
+def plot_symbol_dashboard(symbol, summary, chain, spot, output_dir):
+    """Save per-expiration OI/delta and volume-by-strike charts for one symbol and return the file path."""
+    fig, (ax_oi, ax_vol) = plt.subplots(2, 1, figsize=(12, 9))
+    x = np.arange(len(summary))
+    ax_oi.bar(x - 0.2, summary['callOI'], width=0.4, color='blue', alpha=0.5, label='Calls')
+    ax_oi.bar(x + 0.2, summary['putOI'], width=0.4, color='red', alpha=0.5, label='Puts')
+    ax_oi.set_xticks(x)
+    ax_oi.set_xticklabels([d.strftime('%Y-%m-%d') for d in summary['expirationDate']], rotation=90, fontsize=7)
+    ax_oi.set_title(f'Open Interest by Expiration for {symbol}')
+    ax_oi.legend()
+    ax_oi.grid(True)
+
+    volume = chain.groupby(['strike', 'CALL'])['volume'].sum().unstack('CALL', fill_value=0)
+    for side, color, label in ((True, 'blue', 'Calls'), (False, 'red', 'Puts')):
+        if side in volume.columns:
+            ax_vol.bar(volume.index, volume[side], width=1, color=color, alpha=0.5, label=label)
+    ax_vol.axvline(x=spot, color='green', linestyle='dashed', linewidth=1, label='Current Price')
+    ax_vol.set_xlim(spot * 0.8, spot * 1.2)
+    ax_vol.set_title(f'Aggregate Volume across Strike Prices for {symbol}')
+    ax_vol.legend()
+    ax_vol.grid(True)
+
+    plt.tight_layout()
+    path = os.path.join(output_dir, f'{symbol}.png')
+    fig.savefig(path, dpi=100)
+    plt.close(fig)
+    return path
+
+
+def analyze_symbol(symbol, chain, spot, output_dir=None):
+    """
+    One dashboard row for a symbol: OI totals and delta, volume totals, put/call ratios,
+    nearest max pain, the call/put walls (largest OI summed over expiries) and constant-maturity ATM IV.
+
+    Runs in a worker process; charts are written to output_dir when it is given.
+    """
+    as_of = pd.Timestamp(datetime.date.today())
+    summary = summarize_expirations(chain)
+    metrics = daily_metrics(chain, as_of)
+    by_strike = strike_open_interest(chain).groupby(level='strike').sum()
+    net_oi = metrics['callOI'] - metrics['putOI']
+
+    row = {
+        'symbol': symbol,
+        'spot': spot,
+        'expirations': len(summary),
+        'callOI': metrics['callOI'],
+        'putOI': metrics['putOI'],
+        'deltaOI': abs(net_oi),
+        'dominant': 'C' if net_oi > 0 else 'P',
+        'pcrOI': metrics['pcrOI'],
+        'callVolume': metrics['callVolume'],
+        'putVolume': metrics['putVolume'],
+        'pcrVolume': metrics['pcrVolume'],
+        'nextExpiration': summary['expirationDate'].iloc[0] if len(summary) else pd.NaT,
+        'nextMaxPain': summary['maxPain'].iloc[0] if len(summary) else np.nan,
+        'callWall': by_strike['callOI'].idxmax() if len(by_strike) else np.nan,
+        'putWall': by_strike['putOI'].idxmax() if len(by_strike) else np.nan,
+    }
+    row.update({k: v for k, v in metrics.items() if k.startswith('atmIV_')})
+    if output_dir is not None:
+        plot_symbol_dashboard(symbol, summary, chain, spot, output_dir)
+    return row
+
+
+def run_watchlist(symbols, output_dir=DEFAULT_OUTPUT_DIR, charts=False, workers=8, processes=None, rate=2.0, use_cache=True):
+    """
+    Fetch, analyze and tabulate a whole watchlist.
+
+    Chains are downloaded on a thread pool (network bound, globally rate limited) and the
+    per-symbol analytics run on a process pool (CPU bound). Writes the consolidated table to
+    output_dir/options_dashboard_<date>.csv and returns it.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    chains = fetch_watchlist(symbols, workers, rate, use_cache)
+    chart_dir = output_dir if charts else None
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = {s: pool.submit(analyze_symbol, s, chain, spot, chart_dir) for s, (chain, spot) in chains.items()}
+        for symbol, future in futures.items():
+            try:
+                rows.append(future.result())
+            except Exception as e:
+                print(f"Failed to analyze {symbol}: {e}")
+
+    dashboard = pd.DataFrame(rows)
+    if len(dashboard):
+        dashboard = dashboard.set_index('symbol').reindex([s for s in symbols if s in set(dashboard['symbol'])]).reset_index()
+    dashboard.to_csv(os.path.join(output_dir, f"options_dashboard_{datetime.date.today():%Y-%m-%d}.csv"), index=False)
+    return dashboard
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Options dashboard for a whole watchlist.")
+    parser.add_argument('symbols', nargs='*', help="Ticker symbols (or use --watchlist)")
+    parser.add_argument('--watchlist', help="Text file with symbols")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_DIR, help="Output directory for the table and charts")
+    parser.add_argument('--charts', action='store_true', help="Save a PNG dashboard per symbol")
+    parser.add_argument('--workers', type=int, default=8, help="Concurrent download threads")
+    parser.add_argument('--processes', type=int, default=None, help="Analytics worker processes")
+    parser.add_argument('--rate', type=float, default=2.0, help="Max Yahoo requests per second across all threads")
+    parser.add_argument('--refresh', action='store_true', help="Ignore today's stored snapshots and download again")
+    args = parser.parse_args()
+
+    symbols = [s.upper() for s in args.symbols]
+    if args.watchlist:
+        symbols += read_watchlist(args.watchlist)
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        parser.error("No symbols given.")
+
+    dashboard = run_watchlist(symbols, args.output, args.charts, args.workers, args.processes, args.rate, not args.refresh)
+    print(dashboard.to_string(index=False, float_format='{:.3f}'.format))
+
+
+if __name__ == "__main__":
+    main()
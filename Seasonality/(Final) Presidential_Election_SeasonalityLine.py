@@ -1,36 +1,24 @@
-import yfinance as yf
 import pandas as pd
 import matplotlib.pyplot as plt
+from seasonality_cube import load_cube, select_years, period_returns
+from calendar_cycles import presidential_cycle
 
 def fetch_data(ticker, start_year):
-    end_date = pd.Timestamp.today()
-    start_date = pd.Timestamp(f'{start_year}-01-01')
-    data = yf.download(ticker, start=start_date, end=end_date)
-    return data
+    return select_years(load_cube(ticker), start_year)
 
 def calculate_yearly_returns(data):
-    data['Year'] = data.index.year
-    yearly_returns = data['Adj Close'].resample('Y').ffill().pct_change() * 100  # Convert to percentage
-    yearly_returns = yearly_returns.reset_index()
-    yearly_returns['Year'] = yearly_returns['Date'].dt.year
-    yearly_returns = yearly_returns.dropna()  # Drop NA values which result from pct_change
-    return yearly_returns
+    yearly_returns = period_returns(data, ('year',))  # Calendar-year return in percent
+    return pd.DataFrame({'Year': yearly_returns.index, 'Return': yearly_returns.to_numpy()})
 
 def assign_presidential_years(data):
-    # Assigning the presidential cycle years assuming 2024 is an election year
-    data['Presidential Year'] = (data['Year'] - 2024) % 4
-    data['Presidential Year'] = data['Presidential Year'].replace({
-        0: 'Election Year', 
-        1: 'Year 1 in Office', 
-        2: 'Year 2 in Office', 
-        3: 'Pre-Election Year'
-    })
+    # Election years are the years divisible by 4
+    data['Presidential Year'] = presidential_cycle(data['Year'].to_numpy())
     return data
 
 def calculate_cumulative_returns(data):
-    # Calculating the cumulative returns correctly
-    data['Return'] = data['Adj Close']
-    data['Cumulative Return'] = data.groupby('Presidential Year')['Return'].cumsum()
+    # Compound each phase's yearly returns through time
+    growth = (1 + data['Return'] / 100).groupby(data['Presidential Year']).cumprod()
+    data['Cumulative Return'] = (growth - 1) * 100
     return data
 
 def plot_presidential_seasonality(data):
@@ -1,32 +1,30 @@
-import yfinance as yf
 import pandas as pd
 import matplotlib.pyplot as plt
+from seasonality_cube import load_cube, select_years, monthly_return_matrix
+from seasonal_bootstrap import monthly_path_matrix, bootstrap_bands
 
 def fetch_data(ticker, years_back):
-    end_date = pd.Timestamp.today()
-    start_date = end_date - pd.DateOffset(years=years_back)
-    data = yf.download(ticker, start=start_date, end=end_date)
-    return data, start_date.year
+    start_year = pd.Timestamp.today().year - years_back
+    return select_years(load_cube(ticker), start_year), start_year
 
 def calculate_monthly_returns(data):
-    data['Month'] = data.index.month
-    data['Year'] = data.index.year
-    monthly_returns = data['Adj Close'].resample('M').ffill().pct_change() * 100  # Convert to percentage
-    monthly_returns = monthly_returns.reset_index()
-    monthly_returns['Month'] = monthly_returns['Date'].dt.month
-    monthly_returns['Year'] = monthly_returns['Date'].dt.year
-    return monthly_returns
+    return monthly_return_matrix(data)  # Year x month, in percent
 
 def calculate_cumulative_average_returns(monthly_returns, current_year):
-    monthly_avg_returns = monthly_returns.groupby(['Month', 'Year'])['Adj Close'].mean().unstack()
-    cumulative_avg_returns = monthly_avg_returns.cumsum(axis=0)
+    cumulative_avg_returns = monthly_returns.T.cumsum(axis=0)
     avg_returns = cumulative_avg_returns.mean(axis=1)
     current_year_returns = cumulative_avg_returns[current_year]
     return avg_returns, current_year_returns
 
-def plot_seasonality(avg_returns, current_year_returns, current_year, start_year):
+def calculate_confidence_bands(data, ci=90):
+    # Years resampled as whole blocks; band of the average cumulative path
+    return bootstrap_bands(monthly_path_matrix(data), ci=ci)
+
+def plot_seasonality(avg_returns, current_year_returns, current_year, start_year, bands=None):
     plt.figure(figsize=(10, 6))
     plt.plot(avg_returns.index, avg_returns.values, label=f'Average Returns Since {start_year}')
+    if bands is not None:
+        plt.fill_between(bands.index, bands['lower'], bands['upper'], alpha=0.2, label='90% Bootstrap Band')
     plt.plot(current_year_returns.index, current_year_returns.values, label=f'{current_year} Returns')
     plt.xlabel('Month')
     plt.ylabel('Cumulative Average Return (%)')
@@ -53,7 +51,8 @@ def main():
     data, start_year = fetch_data(ticker, years_back)
     monthly_returns = calculate_monthly_returns(data)
     avg_returns, current_year_returns = calculate_cumulative_average_returns(monthly_returns, current_year)
-    plot_seasonality(avg_returns, current_year_returns, current_year, start_year)
+    bands = calculate_confidence_bands(data)
+    plot_seasonality(avg_returns, current_year_returns, current_year, start_year, bands)
 
 if __name__ == "__main__":
     main()
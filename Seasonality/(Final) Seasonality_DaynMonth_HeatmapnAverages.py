@@ -1,32 +1,26 @@
-import yfinance as yf
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 from datetime import datetime
+from seasonality_cube import load_cube, seasonal_pivot
+from seasonal_bootstrap import day_of_month_matrix, permutation_pvalues, benjamini_hochberg
 
 def fetch_daily_returns(symbol, start_year):
-    # Download historical data up to the most recent available date
-    end_date = datetime.now()
-    data = yf.download(symbol, start=f'{start_year}-01-01', end=end_date)
-    data['Year'] = data.index.year
-    data['Month'] = data.index.month
-    data['Day'] = data.index.day
-
-    # Calculate daily returns
-    data['Daily Return'] = data['Adj Close'].pct_change() * 100
-
-    # Filter data for the specified range
-    data = data[data['Year'] >= start_year]
-
-    # Pivot table to get a matrix of daily returns
-    daily_returns = data.pivot_table(index='Month', columns='Day', values='Daily Return')
+    # Month x day-of-month matrix of average daily returns from the cached seasonality cube
+    cube = load_cube(symbol)
+    daily_returns = seasonal_pivot(cube, 'month', 'day', start_year=start_year)
 
     # Calculate the average returns
     avg_returns = daily_returns.mean()
 
-    return daily_returns, avg_returns
+    # Permutation p-value of every cell (is the cell mean distinguishable from noise?),
+    # corrected for testing all cells at once
+    q_values = benjamini_hochberg(permutation_pvalues(day_of_month_matrix(cube, start_year))).unstack('day')
+    q_values = q_values.reindex(index=daily_returns.index, columns=daily_returns.columns)
 
-def plot_seasonality_heatmap(daily_returns, avg_returns, symbol, start_year):
+    return daily_returns, avg_returns, q_values
+
+def plot_seasonality_heatmap(daily_returns, avg_returns, symbol, start_year, q_values=None):
     fig, ax = plt.subplots(2, 1, figsize=(18, 12), gridspec_kw={'height_ratios': [4, 1]})
     
     # Plot the heatmap for the main data
@@ -39,6 +33,12 @@ def plot_seasonality_heatmap(daily_returns, avg_returns, symbol, start_year):
     ax[0].set_xlabel('Day of Month')
     ax[0].set_ylabel('Month')
 
+    # Mark cells whose mean is significant at a 5% false discovery rate with a dot in the corner
+    if q_values is not None:
+        rows, cols = (q_values.to_numpy() < 0.05).nonzero()
+        ax[0].scatter(cols + 0.85, rows + 0.2, s=12, color='red', marker='o', label='q < 0.05')
+        ax[0].legend(loc='upper right', bbox_to_anchor=(1.0, 1.06), fontsize=8)
+
     # Highlight the current month and day
     current_month = datetime.now().month
     current_day = datetime.now().day
@@ -73,8 +73,8 @@ def main():
     symbol = input("Enter the stock symbol (e.g., 'AAPL'): ").strip()
     start_year = int(input("Enter the starting year for analysis: "))
     
-    daily_returns, avg_returns = fetch_daily_returns(symbol, start_year)
-    plot_seasonality_heatmap(daily_returns, avg_returns, symbol, start_year)
+    daily_returns, avg_returns, q_values = fetch_daily_returns(symbol, start_year)
+    plot_seasonality_heatmap(daily_returns, avg_returns, symbol, start_year, q_values)
 
 if __name__ == "__main__":
     main()
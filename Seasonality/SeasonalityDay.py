@@ -1,27 +1,17 @@
 import pandas as pd
-import yfinance as yf
 import matplotlib.pyplot as plt
 from datetime import datetime
+from seasonality_cube import load_cube, select_years, weekday_stats
 
 def load_data():
     ticker = "^GSPC"  # S&P 500 ticker symbol
-    end_date = datetime.now()
-    start_date = datetime(end_date.year - 25, end_date.month, end_date.day)
-    try:
-        df = yf.download(ticker, start=start_date, end=end_date)
-        df.reset_index(inplace=True)
-        return df
-    except Exception as e:
-        print("Failed to download data:", e)
+    cube = load_cube(ticker)
+    if cube is None:
         return pd.DataFrame()
-
-def prepare_data(df):
-    df['Day of Week'] = df['Date'].dt.day_name()
-    df['Daily Return'] = df['Adj Close'].pct_change()
-    return df
+    return select_years(cube, datetime.now().year - 25)
 
 def compute_statistics(df):
-    return df.groupby('Day of Week')['Daily Return'].agg(['mean', 'min', 'max'])
+    return weekday_stats(df)  # Daily returns in percent, Monday to Friday
 
 def plot_statistics(stats):
     fig, ax = plt.subplots(3, 1, figsize=(10, 15))
@@ -29,17 +19,17 @@ def plot_statistics(stats):
     # Average Returns
     ax[0].bar(stats.index, stats['mean'], color='skyblue')
     ax[0].set_title('Average Returns by Day of Week')
-    ax[0].set_ylabel('Average Return')
+    ax[0].set_ylabel('Average Return (%)')
 
     # Minimum Returns
     ax[1].bar(stats.index, stats['min'], color='salmon')
     ax[1].set_title('Minimum Returns by Day of Week')
-    ax[1].set_ylabel('Minimum Return')
+    ax[1].set_ylabel('Minimum Return (%)')
 
     # Maximum Returns
     ax[2].bar(stats.index, stats['max'], color='lightgreen')
     ax[2].set_title('Maximum Returns by Day of Week')
-    ax[2].set_ylabel('Maximum Return')
+    ax[2].set_ylabel('Maximum Return (%)')
 
     for axis in ax:
         axis.set_xlabel('Day of the Week')
@@ -53,8 +43,7 @@ def spx_day_of_week_stats():
     if df.empty:
         print("Data loading is not properly implemented. Load your SPX data first.")
         return
-    prepared_data = prepare_data(df)
-    stats = compute_statistics(prepared_data)
+    stats = compute_statistics(df)
     plot_statistics(stats)
 
 # Example usage:
@@ -1,40 +1,22 @@
-import pandas as pd
 import matplotlib.pyplot as plt
-import requests
+from seasonality_cube import load_cube, select_years, period_returns
 
-def fetch_fred_data(series_id, start_date, api_key):
-    url = f"https://api.stlouisfed.org/fred/series/observations?series_id={series_id}&observation_start={start_date}&api_key={api_key}&file_type=json"
-    response = requests.get(url)
-    data = response.json()
-    return pd.DataFrame(data['observations'])
-
-def calculate_monthly_returns(df, date_column, value_column):
-    df[date_column] = pd.to_datetime(df[date_column])
-    df['Month'] = df[date_column].dt.month
-    df['Year'] = df[date_column].dt.year
-    df.set_index(date_column, inplace=True)
-    df[value_column] = pd.to_numeric(df[value_column], errors='coerce')
-    monthly_returns = df[value_column].resample('MS').ffill().pct_change()
-    return monthly_returns
-
-def plot_seasonality(year_ranges, series_id, api_key):
+def plot_seasonality(year_ranges, symbol):
     plt.figure(figsize=(15, 10))
-    
+    cube = load_cube(symbol)  # One cached cube serves every range
+
     for i, (start_year, end_year) in enumerate(year_ranges):
-        start_date = f"{start_year}-01-01"
-        
-        df = fetch_fred_data(series_id, start_date, api_key)
-        
-        if df.empty:
+        data = select_years(cube, start_year, end_year)
+
+        if data.empty:
             print(f"No data available for the range starting {start_year}")
             continue
-        
-        end_date = df['date'].max()[:10]  # Get the last available date
-        end_year = pd.to_datetime(end_date).year
-        
-        monthly_returns = calculate_monthly_returns(df, 'date', 'value')
-        
-        monthly_avg_returns = monthly_returns.groupby(monthly_returns.index.month).mean()
+
+        end_year = int(data['year'].iloc[-1])
+
+        monthly_returns = period_returns(data)  # Compounded % return per (year, month)
+
+        monthly_avg_returns = monthly_returns.groupby(level='month').mean()
         overall_avg_return = monthly_returns.mean()
         
         ax = plt.subplot(len(year_ranges), 1, i + 1)
@@ -42,7 +24,7 @@ def plot_seasonality(year_ranges, series_id, api_key):
         ax.axhline(y=overall_avg_return, color='r', linestyle='--', label='Overall Avg Return')
         ax.set_title(f'Average Monthly Returns ({start_year}-{end_year})')
         ax.set_xlabel('Month')
-        ax.set_ylabel('Average Return')
+        ax.set_ylabel('Average Return (%)')
         ax.legend()
     
     plt.tight_layout()
@@ -50,8 +32,7 @@ def plot_seasonality(year_ranges, series_id, api_key):
 
 if __name__ == "__main__":
     # Prompt the user for input
-    api_key = '2799e7146b69c660e478eaaf3b3750a6'
-    series_id = 'SP500'  # Example series ID for S&P 500
+    symbol = '^GSPC'  # S&P 500
     year_ranges = []
     
     while True:
@@ -61,4 +42,4 @@ if __name__ == "__main__":
         year_ranges.append((int(start_year), None))
     
     if year_ranges:
-        plot_seasonality(year_ranges, series_id, api_key)
+        plot_seasonality(year_ranges, symbol)
@@ -1,7 +1,7 @@
-import yfinance as yf
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
+from seasonality_cube import load_cube, select_years, seasonal_pivot
 
 # User inputs for stock symbol and number of years back to analyze
 symbol = input("Enter the stock symbol (e.g., 'SPY' for S&P 500 ETF): ").strip()
@@ -14,19 +14,16 @@ start_date = end_date - pd.DateOffset(years=years_back)
 # Adjust start date to the beginning of the year to ensure coverage of all months
 start_date = pd.Timestamp(year=start_date.year, month=1, day=1)
 
-# Download historical data from Yahoo Finance
-data = yf.download(symbol, start=start_date.strftime("%Y-%m-%d"), end=end_date.strftime("%Y-%m-%d"))
+# Daily history from the shared price store via the seasonality cube
+cube = load_cube(symbol)
+data = select_years(cube, start_date.year) if cube is not None else pd.DataFrame()
 
 # Check if data is loaded
 if data.empty:
     print("No data fetched. Check the stock symbol or network connection.")
 else:
-    # Extract year and month from the index
-    data['Year'] = data.index.year
-    data['Month'] = data.index.month
-
-    # Group by year and month, then calculate the average volume
-    monthly_volume = data.groupby(['Year', 'Month'])['Volume'].mean().unstack()
+    # Year x month table of the average daily volume
+    monthly_volume = seasonal_pivot(data, 'year', 'month', value='volume')
 
     # Plotting the heatmap
     plt.figure(figsize=(12, 8))
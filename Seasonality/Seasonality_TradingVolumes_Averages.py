@@ -1,7 +1,8 @@
-import yfinance as yf
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+from seasonality_cube import load_cube, select_years
+from volume_seasonality import volume_frame, volume_profiles, profile_table
 
 # User inputs for stock symbol and number of years back to analyze
 symbol = input("Enter the stock symbol (e.g., 'SPY' for S&P 500 ETF): ").strip()
@@ -11,25 +12,40 @@ years_back = int(input("Enter the number of years back to analyze (e.g., 1, 2, 1
 end_date = pd.to_datetime('today')
 start_date = pd.Timestamp(year=end_date.year - years_back, month=1, day=1)
 
-# Download historical data from Yahoo Finance
-data = yf.download(symbol, start=start_date.strftime("%Y-%m-%d"), end=end_date.strftime("%Y-%m-%d"))
+# Daily history from the shared price store via the seasonality cube
+cube = load_cube(symbol)
+data = select_years(cube, start_date.year) if cube is not None else pd.DataFrame()
 
 # Check if data is loaded
 if data.empty:
     print("No data fetched. Check the stock symbol or network connection.")
 else:
-    # Extract month from the index
-    data['Month'] = data.index.month
-
     # Group by month, then calculate the average volume for each month across all years
-    monthly_avg_volume = data.groupby('Month')['Volume'].mean()
-
-    # Plotting the average monthly volume using a bar chart
-    plt.figure(figsize=(10, 6))
-    sns.barplot(x=monthly_avg_volume.index, y=monthly_avg_volume.values, palette="viridis")
-    plt.title(f'Average Monthly Volume for {symbol} over the past {years_back} years')
-    plt.xlabel('Month')
-    plt.ylabel('Average Volume')
-    plt.xticks(ticks=range(12), labels=['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'])
-    plt.grid(True, which='both', linestyle='--', linewidth=0.5)
+    monthly_avg_volume = data.groupby('month')['volume'].mean()
+
+    # Volume relative to its trailing median, profiled by calendar bucket
+    frame = volume_frame(data)
+    frame.insert(0, 'symbol', symbol)
+    profiles = volume_profiles(frame)
+
+    fig, ax = plt.subplots(2, 2, figsize=(14, 9))
+    sns.barplot(x=monthly_avg_volume.index, y=monthly_avg_volume.values, hue=monthly_avg_volume.index,
+                palette="viridis", legend=False, ax=ax[0, 0])
+    ax[0, 0].set_title(f'Average Monthly Volume for {symbol} over the past {years_back} years')
+    ax[0, 0].set_xlabel('Month')
+    ax[0, 0].set_ylabel('Average Volume')
+    ax[0, 0].set_xticks(ticks=range(12), labels=['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'])
+
+    panels = [(ax[0, 1], 'weekday', 'Weekday'), (ax[1, 0], 'opexWeek', 'Monthly OPEX Week'),
+              (ax[1, 1], 'holidayOffset', 'Sessions Before (-) / After (+) Holiday')]
+    for axis, dimension, label in panels:
+        relative = profile_table(profiles, dimension).loc[symbol]
+        axis.bar([str(b) for b in relative.index], relative.values, color='tab:blue', alpha=0.75)
+        axis.axhline(1, color='gray', linestyle='--', linewidth=0.8)
+        axis.set_title(f'Relative Volume by {label}')
+        axis.set_ylabel('Volume / Trailing Median')
+
+    for axis in ax.flat:
+        axis.grid(True, which='both', linestyle='--', linewidth=0.5)
+    plt.tight_layout()
     plt.show()
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+from seasonality_cube import period_returns
+
+PRESIDENTIAL_LABELS = {0: 'Election Year', 1: 'Year 1 in Office', 2: 'Year 2 in Office', 3: 'Pre-Election Year'}
+
+
+def presidential_cycle(years):
+    """Phase of the 4-year US presidential cycle; election years are the years divisible by 4."""
+    years = np.asarray(years)
+    return np.array([PRESIDENTIAL_LABELS[p] for p in range(4)], dtype=object)[years % 4]
+
+
+def decennial_cycle(years):
+    """Last digit of the year ('Year 0' ... 'Year 9')."""
+    years = np.asarray(years)
+    return np.array([f'Year {d}' for d in range(10)], dtype=object)[years % 10]
+
+
+def midterm_cycle(years):
+    """'Midterm Year' for US midterm election years, 'Other' otherwise."""
+    years = np.asarray(years)
+    return np.where(years % 4 == 2, 'Midterm Year', 'Other').astype(object)
+
+
+def year_list_cycle(year_lists, default=None):
+    """
+    Cycle from explicit year lists, e.g. {'B': [1935, 1945, ...], 'C': [1931, 1942, ...]}.
+
+    Years in no list get the default phase (None leaves them out of every phase).
+    """
+    lookup = {year: label for label, years in year_lists.items() for year in years}
+
+    def cycle(years):
+        return np.array([lookup.get(int(y), default) for y in np.asarray(years)], dtype=object)
+    return cycle
+
+
+CYCLES = {
+    'presidential': presidential_cycle,
+    'decennial': decennial_cycle,
+    'midterm': midterm_cycle,
+}
+
+
+def _as_cycle(cycle):
+    return CYCLES[cycle] if isinstance(cycle, str) else cycle
+
+
+def phase_of(cube, cycle):
+    """Phase label of every row of a seasonality cube."""
+    years = cube['year'].to_numpy()
+    unique, inverse = np.unique(years, return_inverse=True)
+    return _as_cycle(cycle)(unique)[inverse]
+
+
+def yearly_phase_returns(cube, cycle):
+    """Calendar-year % return of every year with its phase (complete and partial years alike)."""
+    yearly = period_returns(cube, ('year',))
+    return pd.DataFrame({'phase': _as_cycle(cycle)(yearly.index.to_numpy()), 'return': yearly.to_numpy()},
+                        index=pd.Index(yearly.index, name='year'))
+
+
+def phase_distribution(cube, cycle):
+    """Mean, median, std, min, max, win rate and count of calendar-year returns per phase."""
+    yearly = yearly_phase_returns(cube, cycle).dropna(subset=['phase'])
+    grouped = yearly.groupby('phase')['return']
+    table = grouped.agg(['mean', 'median', 'std', 'min', 'max', 'count'])
+    table.insert(5, 'winRate', grouped.apply(lambda r: (r > 0).mean() * 100))
+    return table
+
+
+def phase_paths(cube, cycle, exclude_years=()):
+    """
+    Average cumulative % path through the year per phase, aligned on trading day of year.
+
+    The cube is pivoted once into a (year x trading day) matrix of log returns; its running sum
+    gives every year's path and the phases are then just row groups of that matrix.
+    Returns a frame indexed by trading day of year with one column per phase.
+    """
+    cube = cube[~cube['year'].isin(list(exclude_years))]
+    matrix = cube.pivot_table(index='year', columns='tdoy', values='logRet', aggfunc='sum')
+    paths = np.expm1(matrix.fillna(0).cumsum(axis=1).where(matrix.notna())) * 100
+    phases = _as_cycle(cycle)(paths.index.to_numpy())
+    keep = pd.notna(phases)
+    return paths[keep].groupby(phases[keep]).mean().T
+
+
+def cycle_signals(cube, signal_by_phase, cycle):
+    """Daily signal (+1 buy, -1 sell, 0 none) from the phase of each row's year."""
+    phases = phase_of(cube, cycle)
+    return pd.Series([signal_by_phase.get(p, 0) for p in phases], index=cube.index, dtype=float)
+
+
+def backtest_signals(close, signals):
+    """
+    Long/flat equity curve (growth of 1) from buy/sell signals, without a per-row loop.
+
+    A +1 buys at that day's close if flat and a -1 sells at that day's close if long; the
+    position is the last non-zero signal carried forward (flat before the first buy), so the
+    strategy earns each day's return only when it was long at the previous close.
+    """
+    close = pd.Series(close, dtype=float)
+    state = pd.Series(np.where(signals != 0, signals, np.nan), index=close.index).ffill().fillna(-1)
+    held = (state > 0).astype(float).shift(1, fill_value=0.0)
+    return (1 + held * close.pct_change().fillna(0)).cumprod()
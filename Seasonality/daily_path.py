@@ -0,0 +1,134 @@
+import argparse
+import datetime
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from seasonality_cube import load_cube, select_years, monthly_return_matrix
+from calendar_cycles import presidential_cycle
+
+ALIGNMENTS = ('tdoy', 'tdoyToEnd')
+
+
+def _days_to_year_end(last_date):
+    """Weekdays left in the year after last_date (holidays not excluded) for a year still in progress."""
+    year_end = pd.Timestamp(last_date.year, 12, 31)
+    return int(np.busday_count((last_date + pd.Timedelta(days=1)).date(), (year_end + pd.Timedelta(days=1)).date()))
+
+
+def day_path_matrix(cube, align='tdoy'):
+    """
+    Year x trading-day table of cumulative % returns since the prior year's last close.
+
+    With align='tdoy' column t is the t-th session of the year. With align='tdoyToEnd'
+    columns count sessions to the last session of the year (0 is the last day, -1 the day
+    before, ...), so year ends line up instead of year starts; the year in progress is placed
+    by its remaining weekdays. The cube is scattered into the matrix with one fancy-indexed
+    assignment and the paths are a single cumulative sum along the rows.
+    """
+    if align not in ALIGNMENTS:
+        raise ValueError(f"align must be one of {ALIGNMENTS}")
+    cube = cube[cube['logRet'].notna()]
+    if align == 'tdoy':
+        cube = cube[cube['tdoy'].notna()]  # a year the history starts partway into has no counts
+    years, row = np.unique(cube['year'].to_numpy(), return_inverse=True)
+    if align == 'tdoy':
+        position = cube['tdoy'].to_numpy(dtype=int) - 1
+        columns = np.arange(1, position.max() + 2)
+    else:
+        to_end = cube['tdoyToEnd'].to_numpy(dtype=float, na_value=np.nan)
+        in_progress = np.isnan(to_end)
+        if in_progress.any():
+            last = cube.index[in_progress]
+            to_end[in_progress] = _days_to_year_end(last[-1]) + len(last) - 1 - np.arange(len(last))
+        longest = int(to_end.max())
+        position = (longest - to_end).astype(int)
+        columns = np.arange(-longest, 1)
+
+    log_returns = np.full((len(years), len(columns)), np.nan)
+    log_returns[row, position] = cube['logRet'].to_numpy()
+    paths = np.expm1(np.nancumsum(log_returns, axis=1)) * 100
+    paths[np.isnan(log_returns)] = np.nan
+    return pd.DataFrame(paths, index=pd.Index(years, name='year'), columns=pd.Index(columns, name=align))
+
+
+def election_years(cube):
+    """US presidential election years present in the cube."""
+    years = np.unique(cube['year'].to_numpy())
+    return years[presidential_cycle(years) == 'Election Year']
+
+
+def january_positive_years(cube):
+    """Years whose January closed higher than the prior December."""
+    january = monthly_return_matrix(cube)[1]
+    return january.index[january > 0].to_numpy()
+
+
+YEAR_FILTERS = {
+    'election': election_years,
+    'january_positive': january_positive_years,
+}
+
+
+def seasonal_day_path(paths, years=None, current_year=None):
+    """
+    Average and median path over the selected complete years plus the current year's path.
+
+    paths is a day_path_matrix; years restricts the averaged years (the current year is never
+    part of the average). Filtering is only a row selection, so switching filters is instant.
+    """
+    current_year = current_year or paths.index.max()
+    history = paths[paths.index != current_year]
+    if years is not None:
+        history = history[history.index.isin(list(years))]
+    summary = pd.DataFrame({'average': history.mean(), 'median': history.median()})
+    if current_year in paths.index:
+        summary[current_year] = paths.loc[current_year]
+    summary.attrs['years'] = len(history)
+    return summary
+
+
+def plot_day_path(summary, symbol, title_suffix=''):
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.plot(summary.index, summary['average'], label=f"Average ({summary.attrs.get('years', 0)} years)")
+    ax.plot(summary.index, summary['median'], linestyle='--', alpha=0.7, label='Median')
+    current = [c for c in summary.columns if c not in ('average', 'median')]
+    for year in current:
+        ax.plot(summary.index, summary[year], color='black', linewidth=1.5, label=str(year))
+    ax.axhline(0, color='gray', linewidth=0.8)
+    ax.set_xlabel('Trading Days to Year End' if summary.index.name == 'tdoyToEnd' else 'Trading Day of Year')
+    ax.set_ylabel('Cumulative Return (%)')
+    ax.set_title(f'{symbol} Seasonal Path by Trading Day{title_suffix}')
+    ax.legend()
+    ax.grid(True)
+    ax.text(0.5, 0.5, '@o5341V', fontsize=50, color='gray', ha='center', va='center', alpha=0.5, transform=ax.transAxes)
+    plt.tight_layout()
+    return fig
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trading-day-aligned seasonal path with the current year overlaid.")
+    parser.add_argument('symbol', nargs='?', default='^GSPC', help="Ticker symbol")
+    parser.add_argument('--start-year', type=int, default=None, help="First year of history")
+    parser.add_argument('--align', choices=ALIGNMENTS, default='tdoy', help="Align years on their start or their end")
+    parser.add_argument('--filter', choices=sorted(YEAR_FILTERS), default=None, help="Only average these years")
+    parser.add_argument('--offline', action='store_true', help="Use cached prices only")
+    parser.add_argument('--save', default=None, help="Write the chart to this file instead of showing it")
+    args = parser.parse_args()
+
+    cube = load_cube(args.symbol, offline_mode=args.offline)
+    if cube is None or cube.empty:
+        print(f"No data available for {args.symbol}.")
+        return
+    cube = select_years(cube, args.start_year)
+    years = YEAR_FILTERS[args.filter](cube) if args.filter else None
+    summary = seasonal_day_path(day_path_matrix(cube, args.align), years, datetime.date.today().year)
+    suffix = f" ({args.filter.replace('_', ' ')} years)" if args.filter else ''
+    fig = plot_day_path(summary, args.symbol, suffix)
+    if args.save:
+        fig.savefig(args.save, dpi=150)
+    else:
+        plt.show()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import os
+import argparse
+import datetime
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import matplotlib
+from matplotlib.figure import Figure
+from matplotlib.colors import Normalize
+from matplotlib.patches import Rectangle
+from seasonality_cube import load_cube, monthly_return_matrix
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.expanduser("~"), "seasonality_heatmaps")
+MONTH_LABELS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+def centered_norm(values, center=0.0):
+    """Color scale symmetric around center (seaborn's center= behaviour) over the finite values."""
+    finite = values[np.isfinite(values)]
+    if not len(finite):
+        return Normalize(center - 1, center + 1)
+    span = max(np.abs(finite - center).max(), 1e-12)
+    return Normalize(center - span, center + span)
+
+
+def heatmap_layers(values, cmap='viridis', center=0.0):
+    """
+    Face colors, text colors and text mask of a grid, all as arrays.
+
+    Text is black on light cells and white on dark ones, decided by the relative luminance of
+    every face color at once.
+    """
+    values = np.asarray(values, dtype=float)
+    norm = centered_norm(values, center)
+    faces = matplotlib.colormaps[cmap](norm(np.ma.masked_invalid(values)))
+    luminance = faces[..., :3] @ np.array([0.2126, 0.7152, 0.0722])
+    text_colors = np.where(luminance > 0.5, 'black', 'white')
+    return norm, text_colors, np.isfinite(values)
+
+
+def draw_heatmap(ax, values, row_labels, col_labels, highlight=None, fmt='{:.2f}', cmap='viridis',
+                 center=0.0, fontsize=None):
+    """
+    Annotated heatmap on ax with one pcolormesh call; rows run top to bottom like seaborn.
+
+    highlight is a list of (row, column) positions outlined with a thick border. Cell labels
+    are formatted and colored from precomputed arrays, so no Text object is revisited.
+    """
+    values = np.asarray(values, dtype=float)
+    n_rows, n_cols = values.shape
+    norm, text_colors, has_text = heatmap_layers(values, cmap, center)
+    ax.pcolormesh(np.ma.masked_invalid(values), cmap=cmap, norm=norm, edgecolors='white', linewidth=0.5)
+    ax.set_xlim(0, n_cols)
+    ax.set_ylim(n_rows, 0)
+
+    rows, cols = np.nonzero(has_text)
+    if fontsize is None:
+        fontsize = max(4, min(10, 400 / max(n_rows, n_cols * 2)))
+    for r, c, label, color in zip(rows, cols, [fmt.format(v) for v in values[rows, cols]], text_colors[rows, cols]):
+        ax.text(c + 0.5, r + 0.5, label, ha='center', va='center', color=color, fontsize=fontsize,
+                in_layout=False)
+
+    for r, c in highlight or []:
+        ax.add_patch(Rectangle((c, r), 1, 1, fill=False, edgecolor='black', linewidth=2))
+
+    ax.set_xticks(np.arange(n_cols) + 0.5, labels=[str(c) for c in col_labels])
+    ax.set_yticks(np.arange(n_rows) + 0.5, labels=[str(r) for r in row_labels])
+    ax.tick_params(length=0)
+    return ax
+
+
+def monthly_heatmap_figure(monthly_returns, symbol, start_year, as_of=None, figure=None, cmap='viridis'):
+    """
+    Year x month heatmap with an average row underneath, current month outlined.
+
+    monthly_returns is a monthly_return_matrix; draws into figure (a new headless Figure if None).
+    """
+    as_of = as_of or datetime.date.today()
+    figure = figure or Figure(figsize=(14, max(6, 0.22 * len(monthly_returns) + 3)))
+    ax = figure.subplots(2, 1, gridspec_kw={'height_ratios': [4, 1]})
+    years = monthly_returns.index.to_numpy()
+    averages = monthly_returns.mean().to_numpy()[None, :]
+
+    current_row = np.flatnonzero(years == as_of.year)
+    highlight = [(current_row[0], as_of.month - 1)] if len(current_row) else []
+    draw_heatmap(ax[0], monthly_returns.to_numpy(), years, MONTH_LABELS, highlight, cmap=cmap)
+    ax[0].set_title(f'Seasonality Heatmap for {symbol.upper()} from {start_year} to {years.max()}')
+    ax[0].set_xlabel('Month')
+    ax[0].set_ylabel('Year')
+
+    draw_heatmap(ax[1], averages, ['Avg'], MONTH_LABELS, [(0, as_of.month - 1)], cmap=cmap, fontsize=10)
+    ax[1].set_xlabel('Month')
+    ax[1].set_ylabel('Metrics')
+
+    figure.tight_layout()
+    figure.text(0.99, 0.01, 'Twitter Handle: @o5341V', horizontalalignment='right')
+    return figure
+
+
+def render_monthly_heatmap(symbol, start_year=None, output_dir=DEFAULT_OUTPUT_DIR, fmt='png', offline_mode=True):
+    """Headless PNG/SVG export of one symbol's monthly heatmap; returns the file path (None without data)."""
+    try:
+        cube = load_cube(symbol, offline_mode=offline_mode)
+    except Exception as e:
+        print(f"Failed to load {symbol}: {e}")
+        return None
+    if cube is None or cube.empty:
+        return None
+    monthly_returns = monthly_return_matrix(cube, start_year)
+    figure = monthly_heatmap_figure(monthly_returns, symbol, start_year or monthly_returns.index.min())
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"{symbol.upper().replace('^', '')}_monthly_heatmap.{fmt}")
+    figure.savefig(path, dpi=150)
+    return path
+
+
+def render_batch(symbols, start_year=None, output_dir=DEFAULT_OUTPUT_DIR, fmt='png', offline_mode=True, processes=None):
+    """render_monthly_heatmap for every symbol on a process pool."""
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(render_monthly_heatmap, s, start_year, output_dir, fmt, offline_mode) for s in symbols]
+        return {s: f.result() for s, f in zip(symbols, futures)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export year x month seasonality heatmaps for a batch of tickers.")
+    parser.add_argument('symbols', nargs='+', help="Ticker symbols")
+    parser.add_argument('--start-year', type=int, default=None, help="First year of history")
+    parser.add_argument('--format', choices=('png', 'svg'), default='png', help="Image format")
+    parser.add_argument('--online', action='store_true', help="Update each ticker's prices first")
+    parser.add_argument('--processes', type=int, default=None, help="Worker processes")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_DIR, help="Directory for the images")
+    args = parser.parse_args()
+
+    symbols = list(dict.fromkeys(s.upper() for s in args.symbols))
+    for symbol, path in render_batch(symbols, args.start_year, args.output, args.format, not args.online,
+                                     args.processes).items():
+        print(f"{symbol}: {path}" if path else f"{symbol}: no data available")
+
+
+if __name__ == "__main__":
+    main()
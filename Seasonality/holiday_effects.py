@@ -0,0 +1,204 @@
+import os
+import argparse
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from seasonality_cube import load_cube, select_years, relative_volume
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.expanduser("~"), "seasonality_screens")
+CALENDAR_START = 1970  # first year SPECIAL_CLOSURES is complete for
+
+# Unscheduled full-day NYSE closures since 1970 (weather, 9/11, national days of mourning)
+SPECIAL_CLOSURES = {
+    '1972-12-28': 'Truman Funeral',
+    '1973-01-25': 'Johnson Funeral',
+    '1977-07-14': 'Blackout',
+    '1985-09-27': 'Hurricane Gloria',
+    '1994-04-27': 'Nixon Funeral',
+    '2001-09-11': 'September 11',
+    '2001-09-12': 'September 11',
+    '2001-09-13': 'September 11',
+    '2001-09-14': 'September 11',
+    '2004-06-11': 'Reagan Funeral',
+    '2007-01-02': 'Ford Funeral',
+    '2012-10-29': 'Hurricane Sandy',
+    '2012-10-30': 'Hurricane Sandy',
+    '2018-12-05': 'Bush Funeral',
+    '2025-01-09': 'Carter Funeral',
+}
+
+
+def easter(years):
+    """Gregorian Easter Sunday for an array of years (anonymous Gregorian algorithm)."""
+    y = np.asarray(years)
+    a, b, c = y % 19, y // 100, y % 100
+    d, e = b // 4, b % 4
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month = (h + l - 7 * m + 114) // 31
+    day = (h + l - 7 * m + 114) % 31 + 1
+    return pd.to_datetime({'year': y, 'month': month, 'day': day})
+
+
+def _nth_weekday(years, month, weekday, n):
+    """n-th given weekday (0 = Monday) of a month for every year; n = -1 is the last one."""
+    if n > 0:
+        first = pd.to_datetime({'year': years, 'month': month, 'day': 1})
+        return first + pd.to_timedelta((weekday - first.dt.weekday) % 7 + 7 * (n - 1), unit='D')
+    last = pd.to_datetime({'year': years, 'month': month, 'day': 1}) + pd.offsets.MonthEnd(0)
+    return last - pd.to_timedelta((last.dt.weekday - weekday) % 7, unit='D')
+
+
+def _observed(dates, saturday_to_friday=True):
+    """Saturday holidays move to Friday (unless disabled), Sunday holidays to Monday."""
+    shift = np.select([dates.dt.weekday == 5, dates.dt.weekday == 6], [-1 if saturday_to_friday else 0, 1], 0)
+    observed = dates + pd.to_timedelta(shift, unit='D')
+    return observed[observed.dt.weekday < 5]
+
+
+def _fixed(years, month, day):
+    return pd.to_datetime({'year': years, 'month': month, 'day': day})
+
+
+@lru_cache(maxsize=None)
+def exchange_holidays(start_year=CALENDAR_START, end_year=2100):
+    """
+    Full-day NYSE holidays generated from the exchange's rules, plus SPECIAL_CLOSURES.
+
+    Covers the modern holiday set and its historical variants (Washington's Birthday and
+    Memorial Day on fixed dates before 1971, Election Day closures through 1980, MLK Day from
+    1998, Juneteenth from 2022). New Year's Day falling on a Saturday is not observed on the
+    Friday before. The calendar is complete from CALENDAR_START on; earlier years only hold the
+    rule-based holidays, without the many one-off closures of the 1950s and 1960s. Built once
+    per year range and cached, so tagging a century of dates is only a lookup. Returns a
+    Series of holiday names indexed by date.
+    """
+    years = pd.Series(np.arange(start_year, end_year + 1))
+    rules = [
+        ('New Years Day', _observed(_fixed(years, 1, 1), saturday_to_friday=False)),
+        ('Martin Luther King Jr. Day', _nth_weekday(years[years >= 1998], 1, 0, 3)),
+        ('Washingtons Birthday', _nth_weekday(years[years >= 1971], 2, 0, 3)),
+        ('Washingtons Birthday', _observed(_fixed(years[years < 1971], 2, 22))),
+        ('Good Friday', easter(years) - pd.Timedelta(days=2)),
+        ('Memorial Day', _nth_weekday(years[years >= 1971], 5, 0, -1)),
+        ('Memorial Day', _observed(_fixed(years[years < 1971], 5, 30))),
+        ('Juneteenth', _observed(_fixed(years[years >= 2022], 6, 19))),
+        ('Independence Day', _observed(_fixed(years, 7, 4))),
+        ('Labor Day', _nth_weekday(years, 9, 0, 1)),
+        ('Election Day', _nth_weekday(years[(years <= 1968) | years.isin([1972, 1976, 1980])], 11, 0, 1)
+         + pd.Timedelta(days=1)),
+        ('Thanksgiving', _nth_weekday(years[years >= 1942], 11, 3, 4)),
+        ('Thanksgiving', _nth_weekday(years[years < 1942], 11, 3, -1)),
+        ('Christmas', _observed(_fixed(years, 12, 25))),
+    ]
+    holidays = pd.concat([pd.Series(name, index=pd.DatetimeIndex(dates)) for name, dates in rules])
+    special = pd.Series(SPECIAL_CLOSURES)
+    special.index = pd.to_datetime(special.index)
+    holidays = pd.concat([holidays, special[(special.index.year >= start_year) & (special.index.year <= end_year)]])
+    holidays = holidays[~holidays.index.duplicated()].sort_index()
+    holidays.index.name = 'Date'
+    return holidays
+
+
+def holiday_offsets(dates, holidays=None, max_offset=5):
+    """
+    Session distance of every date to the nearest exchange holiday and that holiday's name.
+
+    -1 is the last session before a holiday, +1 the first session after it; ties go to the
+    upcoming holiday. Each holiday's slot in the session index is found with one
+    np.searchsorted, so no loop runs over dates or holidays. Only holidays strictly inside the
+    date range are used (one outside it has no session on its far side), and the default
+    calendar starts at CALENDAR_START, so older sessions stay untagged. Offsets beyond
+    max_offset are NaN. Returns a frame with holidayOffset and holiday, indexed like dates.
+    """
+    dates = pd.DatetimeIndex(dates)
+    if holidays is None:
+        holidays = exchange_holidays(CALENDAR_START, max(2100, dates.year.max() + 1))
+    if len(dates):
+        holidays = holidays[(holidays.index > dates[0]) & (holidays.index < dates[-1])]
+    if not len(holidays):
+        return pd.DataFrame({'holidayOffset': np.nan, 'holiday': None}, index=dates)
+    # A holiday's slot is the position of the first session after it
+    slots = np.searchsorted(dates.to_numpy(), holidays.index.to_numpy(), side='left')
+    names = holidays.to_numpy()
+    positions = np.arange(len(dates))
+
+    upcoming = np.searchsorted(slots, positions, side='right')
+    previous = upcoming - 1
+    has_next, has_prev = upcoming < len(slots), previous >= 0
+    before = np.where(has_next, slots[np.minimum(upcoming, len(slots) - 1)] - positions, np.inf)
+    after = np.where(has_prev, positions - slots[np.maximum(previous, 0)] + 1, np.inf)
+    use_next = before <= after
+    offset = np.where(use_next, -before, after)
+    name = np.where(use_next, names[np.minimum(upcoming, len(slots) - 1)], names[np.maximum(previous, 0)])
+    near = np.abs(offset) <= max_offset
+    return pd.DataFrame({'holidayOffset': np.where(near, offset, np.nan),
+                         'holiday': np.where(near, name, None)}, index=dates)
+
+
+def tag_holidays(cube, max_offset=5, window=63):
+    """Cube rows tagged with holiday offsets, plus volume relative to the median of the previous `window` sessions."""
+    tagged = cube[['ret', 'volume']].join(holiday_offsets(cube.index, max_offset=max_offset))
+    tagged['relVolume'] = relative_volume(cube, window)
+    return tagged
+
+
+def holiday_effects(cubes, max_offset=5, by_holiday=False, start_year=None):
+    """
+    Average daily % return, win rate, relative volume and count by holiday offset for every
+    cube in a {symbol: cube} mapping, computed in one groupby over the stacked frames.
+
+    by_holiday splits the offsets by holiday name (e.g. the day before Thanksgiving). An
+    'All Days' row per symbol holds the unconditional baseline.
+    """
+    frames = []
+    for symbol, cube in cubes.items():
+        if cube is None or cube.empty:
+            continue
+        tagged = tag_holidays(select_years(cube, start_year), max_offset)
+        tagged.insert(0, 'symbol', symbol)
+        frames.append(tagged)
+    if not frames:
+        return pd.DataFrame()
+    data = pd.concat(frames).dropna(subset=['ret'])
+    data['up'] = data['ret'] > 0
+
+    keys = ['symbol', 'holiday', 'holidayOffset'] if by_holiday else ['symbol', 'holidayOffset']
+    aggregations = dict(meanReturn=('ret', 'mean'), winRate=('up', 'mean'), relVolume=('relVolume', 'mean'),
+                        count=('ret', 'size'))
+    effects = data.dropna(subset=['holidayOffset']).groupby(keys).agg(**aggregations).reset_index()
+    baseline = data.groupby('symbol').agg(**aggregations).reset_index()
+    baseline['holidayOffset'] = np.nan
+    if by_holiday:
+        baseline['holiday'] = 'All Days'
+    effects = pd.concat([effects, baseline[effects.columns]], ignore_index=True)
+    effects['winRate'] *= 100
+    return effects
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Returns, win rates and volume around exchange holidays.")
+    parser.add_argument('symbols', nargs='*', default=['^GSPC'], help="Ticker symbols")
+    parser.add_argument('--start-year', type=int, default=None, help="First year of history")
+    parser.add_argument('--max-offset', type=int, default=3, help="Sessions before/after a holiday to report")
+    parser.add_argument('--by-holiday', action='store_true', help="Split the offsets by holiday")
+    parser.add_argument('--online', action='store_true', help="Update each ticker's prices first")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_DIR, help="Directory for the CSV table")
+    args = parser.parse_args()
+
+    symbols = list(dict.fromkeys(s.upper() for s in args.symbols))
+    cubes = {s: load_cube(s, offline_mode=not args.online) for s in symbols}
+    effects = holiday_effects(cubes, args.max_offset, args.by_holiday, args.start_year)
+    if effects.empty:
+        print("No data available for the requested symbols.")
+        return
+    os.makedirs(args.output, exist_ok=True)
+    effects.to_csv(os.path.join(args.output, "holiday_effects.csv"), index=False)
+    print(effects.to_string(index=False, float_format='{:.3f}'.format))
+
+
+if __name__ == "__main__":
+    main()
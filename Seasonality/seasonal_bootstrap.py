@@ -0,0 +1,171 @@
+import os
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from seasonality_cube import load_cube, seasonal_pivot, monthly_return_matrix
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.expanduser("~"), "seasonality_screens")
+
+
+def monthly_path_matrix(cube, start_year=None, end_year=None):
+    """Year x month table of cumulative monthly % returns (the path SeasonalityLine_New averages)."""
+    return monthly_return_matrix(cube, start_year, end_year).cumsum(axis=1, skipna=False)
+
+
+def day_of_month_matrix(cube, start_year=None, end_year=None):
+    """Year x (month, day) table of daily % returns, one column per heatmap cell."""
+    return seasonal_pivot(cube, 'year', ['month', 'day'], start_year=start_year, end_year=end_year)
+
+
+def bootstrap_bands(matrix, n_boot=5000, ci=90, seed=None):
+    """
+    Percentile bands of the across-year mean of every column of a (year x column) table.
+
+    Years are resampled as whole blocks, so the dependence between a year's cells is kept.
+    All resamples are drawn at once as multinomial year counts; the resampled means are then a
+    single (resamples x years) @ (years x columns) product, with missing cells dropped from
+    both the sums and the counts.
+    """
+    values = matrix.to_numpy(dtype=float)
+    present = ~np.isnan(values)
+    n_years = len(values)
+    rng = np.random.default_rng(seed)
+    counts = rng.multinomial(n_years, np.full(n_years, 1 / n_years), size=n_boot).astype(float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = (counts @ np.where(present, values, 0.0)) / (counts @ present)
+    tail = (100 - ci) / 2
+    lower, upper = np.nanpercentile(means, [tail, 100 - tail], axis=0)
+    return pd.DataFrame({
+        'mean': np.nanmean(values, axis=0),
+        'lower': lower,
+        'upper': upper,
+        'years': present.sum(axis=0),
+    }, index=matrix.columns)
+
+
+def permutation_pvalues(matrix, n_perm=10000, seed=None, batch=250):
+    """
+    Two-sided permutation p-value of every column mean of a (year x column) table.
+
+    Under the null the calendar label carries no information, so the observations are shuffled
+    across cells (cell sizes kept) and each cell's mean is compared with the pooled mean.
+    Each batch of permutations is one rng.permuted call plus one np.bincount over all cells.
+    The smallest attainable p-value is 1 / (n_perm + 1), so n_perm has to be large enough for
+    a cell to survive the multiple-testing correction across several hundred cells.
+    """
+    values = matrix.to_numpy(dtype=float)
+    present = ~np.isnan(values)
+    observations = values[present]
+    cell = np.nonzero(present)[1]
+    n_cells = values.shape[1]
+    sizes = np.bincount(cell, minlength=n_cells)
+    pooled = observations.mean()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        observed = np.abs(np.bincount(cell, weights=observations, minlength=n_cells) / sizes - pooled)
+
+    rng = np.random.default_rng(seed)
+    exceed = np.zeros(n_cells)
+    for start in range(0, n_perm, batch):
+        rows = min(batch, n_perm - start)
+        shuffled = rng.permuted(np.broadcast_to(observations, (rows, len(observations))), axis=1)
+        ids = (cell + n_cells * np.arange(rows)[:, None]).ravel()
+        sums = np.bincount(ids, weights=shuffled.ravel(), minlength=rows * n_cells).reshape(rows, n_cells)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            exceed += (np.abs(sums / sizes - pooled) >= observed).sum(axis=0)
+    pvalues = (exceed + 1) / (n_perm + 1)
+    return pd.Series(np.where(sizes > 0, pvalues, np.nan), index=matrix.columns)
+
+
+def benjamini_hochberg(pvalues):
+    """
+    Benjamini-Hochberg q-values (false discovery rate adjusted p-values) of a Series of p-values.
+
+    Missing p-values are left out of the family and stay NaN. Testing 366 day-of-month cells at
+    p < 0.05 flags about 18 of them on pure noise; q < 0.05 keeps the expected share of false
+    discoveries among the flagged cells at 5%.
+    """
+    pvalues = pd.Series(pvalues, dtype=float)
+    tested = pvalues.dropna()
+    order = np.argsort(tested.to_numpy(), kind='stable')
+    ranked = tested.to_numpy()[order] * len(tested) / np.arange(1, len(tested) + 1)
+    qvalues = np.empty(len(tested))
+    qvalues[order] = np.minimum(np.minimum.accumulate(ranked[::-1])[::-1], 1.0)
+    return pd.Series(qvalues, index=tested.index).reindex(pvalues.index)
+
+
+def cell_significance(matrix, n_boot=5000, n_perm=10000, ci=90, seed=None):
+    """Bootstrap bands, permutation p-value and its Benjamini-Hochberg q-value for every cell of a (year x cell) table."""
+    stats = bootstrap_bands(matrix, n_boot, ci, seed)
+    stats['pValue'] = permutation_pvalues(matrix, n_perm, seed)
+    stats['qValue'] = benjamini_hochberg(stats['pValue'])
+    return stats
+
+
+def bootstrap_ticker(symbol, start_year=None, n_boot=5000, n_perm=10000, ci=90, seed=None, offline_mode=True):
+    """Monthly-path bands and day-of-month cell significance for one ticker, as long tables."""
+    try:
+        cube = load_cube(symbol, offline_mode=offline_mode)
+    except Exception as e:
+        print(f"Failed to load {symbol}: {e}")
+        return None
+    if cube is None or cube.empty:
+        return None
+    path = bootstrap_bands(monthly_path_matrix(cube, start_year), n_boot, ci, seed).reset_index()
+    cells = cell_significance(day_of_month_matrix(cube, start_year), n_boot, n_perm, ci, seed).reset_index()
+    path.insert(0, 'symbol', symbol)
+    cells.insert(0, 'symbol', symbol)
+    return path, cells
+
+
+def bootstrap_universe(symbols, start_year=None, n_boot=5000, n_perm=10000, ci=90, seed=None,
+                       offline_mode=True, processes=None):
+    """
+    bootstrap_ticker for every symbol on a process pool.
+
+    Returns (paths, cells); cells is sorted by q-value (corrected within each ticker's cells)
+    and then p-value, so the most significant day-of-month effects across the universe come first.
+    """
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(bootstrap_ticker, s, start_year, n_boot, n_perm, ci, seed, offline_mode)
+                   for s in symbols]
+        results = [f.result() for f in futures]
+    results = [r for r in results if r is not None]
+    if not results:
+        return pd.DataFrame(), pd.DataFrame()
+    paths = pd.concat([r[0] for r in results], ignore_index=True)
+    cells = pd.concat([r[1] for r in results], ignore_index=True)
+    return paths, cells.sort_values(['qValue', 'pValue'], ignore_index=True, kind='stable')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bootstrap bands and permutation p-values for seasonal patterns.")
+    parser.add_argument('symbols', nargs='+', help="Ticker symbols")
+    parser.add_argument('--start-year', type=int, default=None, help="First year of history")
+    parser.add_argument('--boot', type=int, default=5000, help="Bootstrap resamples of years")
+    parser.add_argument('--perm', type=int, default=10000, help="Permutations per p-value")
+    parser.add_argument('--ci', type=float, default=90, help="Width of the percentile band (%%)")
+    parser.add_argument('--alpha', type=float, default=0.05, help="q-value (FDR) cut-off for the printed cells")
+    parser.add_argument('--seed', type=int, default=None, help="Random seed")
+    parser.add_argument('--online', action='store_true', help="Update each ticker's prices first")
+    parser.add_argument('--processes', type=int, default=None, help="Worker processes")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_DIR, help="Directory for the CSV tables")
+    args = parser.parse_args()
+
+    symbols = list(dict.fromkeys(s.upper() for s in args.symbols))
+    paths, cells = bootstrap_universe(symbols, args.start_year, args.boot, args.perm, args.ci, args.seed,
+                                      not args.online, args.processes)
+    if cells.empty:
+        print("No seasonality data available for the requested symbols.")
+        return
+    os.makedirs(args.output, exist_ok=True)
+    paths.to_csv(os.path.join(args.output, "seasonal_path_bands.csv"), index=False)
+    cells.to_csv(os.path.join(args.output, "seasonal_cell_significance.csv"), index=False)
+
+    significant = cells[cells['qValue'] < args.alpha]
+    print(f"{len(significant)} of {len(cells)} day-of-month cells with q < {args.alpha} (Benjamini-Hochberg):")
+    print(significant.to_string(index=False, float_format='{:.3f}'.format))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+from seasonality_cube import load_cube
+
+PAIR_COLUMNS = ['Buy Month', 'Sell Month', 'Holding Months', 'Final Return', 'Sharpe Ratio',
+                'Avg Trade Return', 'Win Rate', 'Trades']
+
+
+def _cyclic_sums(by_month):
+    """(12, 11) sums of a per-month quantity over every buy month (rows) and holding length 1..11 (columns)."""
+    doubled = np.concatenate([[0.0], np.cumsum(np.concatenate([by_month, by_month]))])
+    start = np.arange(12)[:, None]
+    length = np.arange(1, 12)[None, :]
+    return doubled[start + length] - doubled[start]
+
+
+def evaluate_month_pairs(cube, start_year=None, risk_free_rate=0.01):
+    """
+    Every buy-month/sell-month pair evaluated at once from a (year x month) table.
+
+    A pair buys at the last close before buy month and sells at the last close before sell
+    month, every year, over the whole history. Per-month totals of log returns, daily returns
+    and squared daily returns are summed over years once; the totals for any
+    cyclic month window are then a difference of prefix sums, so Final Return (growth of 1) and
+    the annualized Sharpe of the daily strategy returns (flat days count as zero return, like
+    the original backtest) need no daily pass per pair. Per-trade statistics come from prefix
+    sums over the flattened monthly timeline.
+
+    Returns one row per (buy, sell) pair: 132 rows with PAIR_COLUMNS.
+    """
+    if start_year is not None:
+        cube = cube[cube['year'] >= start_year]
+    cube = cube[cube['logRet'].notna()]
+    daily = cube['ret'].to_numpy() / 100
+    frame = pd.DataFrame({'year': cube['year'].to_numpy(), 'month': cube['month'].to_numpy(),
+                          'logRet': cube['logRet'].to_numpy(), 'r': daily, 'r2': daily ** 2})
+    by_year_month = frame.groupby(['year', 'month']).agg(logRet=('logRet', 'sum'), r=('r', 'sum'), r2=('r2', 'sum'))
+    by_month = by_year_month.groupby(level='month').sum().reindex(range(1, 13), fill_value=0)
+
+    log_total = _cyclic_sums(by_month['logRet'].to_numpy())
+    r_total = _cyclic_sums(by_month['r'].to_numpy())
+    r2_total = _cyclic_sums(by_month['r2'].to_numpy())
+    n = len(daily)
+    mean = r_total / n
+    variance = (r2_total / n - mean ** 2) * n / (n - 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sharpe = np.sqrt(252) * (mean - risk_free_rate / 252) / np.sqrt(variance)
+
+    # Per-trade returns: one trade per year and pair on the flattened (year, month) timeline
+    monthly = by_year_month['logRet'].unstack('month').reindex(columns=range(1, 13)).to_numpy().ravel()
+    flat = np.concatenate([monthly, np.full(11, np.nan)])  # trades running past the data are incomplete
+    missing = np.concatenate([[0], np.cumsum(np.isnan(flat))])
+    sums = np.concatenate([[0.0], np.cumsum(np.nan_to_num(flat))])
+    starts = np.arange(len(monthly))[:, None]
+    ends = starts + np.arange(1, 12)[None, :]
+    trades = np.where(missing[ends] == missing[starts], np.expm1(sums[ends] - sums[starts]), np.nan)
+    buy_of_start = np.arange(len(monthly)) % 12
+    trade_count = pd.DataFrame(trades).groupby(buy_of_start).count().to_numpy()
+    avg_trade = pd.DataFrame(trades).groupby(buy_of_start).mean().to_numpy()
+    win_rate = pd.DataFrame(np.where(np.isnan(trades), np.nan, trades > 0)).groupby(buy_of_start).mean().to_numpy()
+
+    buy, length = np.meshgrid(np.arange(1, 13), np.arange(1, 12), indexing='ij')
+    results = pd.DataFrame({
+        'Buy Month': buy.ravel(),
+        'Sell Month': ((buy + length - 1) % 12 + 1).ravel(),
+        'Holding Months': length.ravel(),
+        'Final Return': np.exp(log_total).ravel(),
+        'Sharpe Ratio': sharpe.ravel(),
+        'Avg Trade Return': avg_trade.ravel() * 100,
+        'Win Rate': win_rate.ravel() * 100,
+        'Trades': trade_count.ravel(),
+    })
+    return results[PAIR_COLUMNS]
+
+
+def best_pairs_by_holding(results, metric='Final Return'):
+    """Best buy/sell pair for every holding length according to metric."""
+    best = results.loc[results.groupby('Holding Months')[metric].idxmax()]
+    return best.set_index('Holding Months')
+
+
+def screen_month_pairs(symbols, start_year=None, metric='Sharpe Ratio', top_n=5):
+    """Top month pairs per ticker across a universe, ranked by metric."""
+    frames = []
+    for symbol in symbols:
+        cube = load_cube(symbol)
+        if cube is None or cube.empty:
+            print(f"No data available for {symbol}.")
+            continue
+        results = evaluate_month_pairs(cube, start_year)
+        results.insert(0, 'Symbol', symbol)
+        frames.append(results.nlargest(top_n, metric))
+    if not frames:
+        return pd.DataFrame(columns=['Symbol'] + PAIR_COLUMNS)
+    return pd.concat(frames, ignore_index=True).sort_values(metric, ascending=False, ignore_index=True)
@@ -0,0 +1,137 @@
+import os
+import sys
+import argparse
+import datetime
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from seasonality_cube import load_cube, select_years, monthly_return_matrix
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from watchlists import read_watchlist
+
+SP500_URL = 'https://en.wikipedia.org/wiki/List_of_S%26P_500_companies'
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.expanduser("~"), "seasonality_screens")
+
+
+def sp500_tickers():
+    """Current S&P 500 constituents in Yahoo notation (BRK.B -> BRK-B)."""
+    table = pd.read_html(SP500_URL)[0]
+    return [s.replace('.', '-') for s in table['Symbol']]
+
+
+def sample_stats(returns):
+    """Mean (%), win rate (%), t-stat and count of a sample of period returns (%)."""
+    returns = np.asarray(returns, dtype=float)
+    returns = returns[~np.isnan(returns)]
+    n = len(returns)
+    if n < 2:
+        return np.nan, np.nan, np.nan, n
+    mean = returns.mean()
+    std = returns.std(ddof=1)
+    t_stat = mean / (std / np.sqrt(n)) if std > 0 else np.nan
+    return mean, (returns > 0).mean() * 100, t_stat, n
+
+
+def forward_window_returns(cube, as_of, days):
+    """
+    % return over the `days` trading sessions that followed the same calendar date in every prior year.
+
+    Each year's window starts at the first session after that year's copy of as_of (found for all
+    years at once with np.searchsorted), so weekends and holidays never shift the alignment.
+    """
+    as_of = pd.Timestamp(as_of)
+    dates = cube.index.to_numpy()
+    close = cube['close'].to_numpy(dtype=float)
+    years = np.arange(cube['year'].iloc[0], as_of.year)
+    anchors = pd.DatetimeIndex([
+        pd.Timestamp(y, as_of.month, min(as_of.day, pd.Timestamp(y, as_of.month, 1).days_in_month)) for y in years
+    ]).to_numpy()
+    first = np.searchsorted(dates, anchors, side='right')
+    last = first + days - 1
+    valid = (first >= 1) & (last < len(close))
+    returns = np.full(len(years), np.nan)
+    returns[valid] = (close[last[valid]] / close[first[valid] - 1] - 1) * 100
+    return pd.Series(returns, index=years)
+
+
+def screen_ticker(symbol, as_of, days=20, years=20, month=None, offline_mode=True):
+    """Month-of-year and next-`days`-sessions seasonal statistics for one ticker over the last `years` years."""
+    try:
+        cube = load_cube(symbol, offline_mode=offline_mode)
+    except Exception as e:
+        print(f"Failed to load {symbol}: {e}")
+        return None
+    if cube is None or cube.empty:
+        return None
+    as_of = pd.Timestamp(as_of)
+    month = month or as_of.month
+    cube = select_years(cube, as_of.year - years, as_of.year)
+
+    month_mean, month_win, month_t, month_n = sample_stats(monthly_return_matrix(cube, end_year=as_of.year - 1)[month])
+    window_mean, window_win, window_t, window_n = sample_stats(forward_window_returns(cube, as_of, days))
+    return {
+        'symbol': symbol,
+        'monthMean': month_mean,
+        'monthWinRate': month_win,
+        'monthT': month_t,
+        'monthYears': month_n,
+        'nextMean': window_mean,
+        'nextWinRate': window_win,
+        'nextT': window_t,
+        'nextYears': window_n,
+    }
+
+
+def screen_universe(symbols, as_of=None, days=20, years=20, month=None, offline_mode=True, processes=None):
+    """
+    Seasonal statistics for every ticker in a universe, computed on a process pool and ranked
+    by the t-stat of the next-`days`-sessions window (strongest bullish setups first).
+    """
+    as_of = pd.Timestamp(as_of if as_of is not None else datetime.date.today())
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(screen_ticker, s, as_of, days, years, month, offline_mode) for s in symbols]
+        rows = [f.result() for f in futures]
+    table = pd.DataFrame([r for r in rows if r is not None])
+    if table.empty:
+        return table
+    return table.sort_values('nextT', ascending=False, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank a universe by seasonal strength for the coming weeks.")
+    parser.add_argument('symbols', nargs='*', help="Ticker symbols (default: the S&P 500)")
+    parser.add_argument('--watchlist', help="Text file with symbols")
+    parser.add_argument('--days', type=int, default=20, help="Forward window in trading sessions")
+    parser.add_argument('--years', type=int, default=20, help="Years of history per ticker")
+    parser.add_argument('--month', type=int, default=None, help="Month-of-year to report (default: current month)")
+    parser.add_argument('--as-of', default=None, help="Start date of the window (default: today)")
+    parser.add_argument('--online', action='store_true', help="Update each ticker's prices before screening")
+    parser.add_argument('--processes', type=int, default=None, help="Worker processes")
+    parser.add_argument('--top', type=int, default=25, help="Rows to print from each end of the ranking")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_DIR, help="Directory for the ranked CSV")
+    args = parser.parse_args()
+
+    symbols = [s.upper() for s in args.symbols]
+    if args.watchlist:
+        symbols += read_watchlist(args.watchlist)
+    if not symbols:
+        symbols = sp500_tickers()
+
+    table = screen_universe(list(dict.fromkeys(symbols)), args.as_of, args.days, args.years, args.month,
+                            not args.online, args.processes)
+    if table.empty:
+        print("No seasonality data available for the requested symbols.")
+        return
+    os.makedirs(args.output, exist_ok=True)
+    stamp = pd.Timestamp(args.as_of or datetime.date.today()).strftime('%Y-%m-%d')
+    table.to_csv(os.path.join(args.output, f"seasonal_screen_{stamp}_{args.days}d.csv"), index=False)
+
+    print(f"Strongest seasonal setups for the next {args.days} sessions:")
+    print(table.head(args.top).to_string(index=False, float_format='{:.2f}'.format))
+    print(f"\nWeakest seasonal setups for the next {args.days} sessions:")
+    print(table.tail(args.top).iloc[::-1].to_string(index=False, float_format='{:.2f}'.format))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from price_store import load_close
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.expanduser("~"), "seasonality_screens")
+SUMMARY_COLUMNS = ['Total Return', 'CAGR', 'Sharpe Ratio', 'Max Drawdown', 'Trades', 'Win Rate',
+                   'Avg Trade Return', 'Exposure']
+
+
+def _as_rule(rule):
+    """
+    Normalize a calendar rule to a dict with month, day, tdom and offset.
+
+    A rule is a month number or a dict: {'month': 11} is the first session of November,
+    'day' picks the first session on or after that day of the month, 'tdom' the n-th session of
+    the month (negative counts from the end, -1 being the last session), and 'offset' shifts the
+    result by a number of trading sessions.
+    """
+    rule = {'month': rule} if isinstance(rule, (int, np.integer)) else dict(rule)
+    if 'month' not in rule or not 1 <= rule['month'] <= 12:
+        raise ValueError(f"Calendar rule needs a month between 1 and 12: {rule}")
+    if 'day' in rule and 'tdom' in rule:
+        raise ValueError(f"Calendar rule takes either a day or a tdom, not both: {rule}")
+    if rule.get('tdom') == 0 or not 1 <= rule.get('day', 1) <= 31:
+        raise ValueError(f"Calendar rule needs a non-zero tdom and a day between 1 and 31: {rule}")
+    return {'month': rule['month'], 'day': rule.get('day'), 'tdom': rule.get('tdom', 1), 'offset': rule.get('offset', 0)}
+
+
+def _rule_positions(dates, rule, years):
+    """
+    Session position of a calendar rule for every year plus a mask of the years it is valid in.
+
+    A rule is invalid in a year when its day or tdom lands outside the rule's month, e.g. the
+    22nd session of a month with 21 sessions, or day 31 when the last sessions of the month are
+    closed, instead of silently spilling into the neighbouring month.
+    """
+    rule = _as_rule(rule)
+    dates = pd.DatetimeIndex(dates).to_numpy()
+    years = np.asarray(years)
+    month_start = pd.to_datetime({'year': years, 'month': rule['month'], 'day': 1}).to_numpy()
+    if rule['day'] is not None:
+        anchors = month_start + np.timedelta64(rule['day'] - 1, 'D')
+        positions = np.searchsorted(dates, anchors, side='left')
+    elif rule['tdom'] > 0:
+        positions = np.searchsorted(dates, month_start, side='left') + rule['tdom'] - 1
+    else:
+        next_month = (pd.DatetimeIndex(month_start) + pd.offsets.MonthBegin(1)).to_numpy()
+        positions = np.searchsorted(dates, next_month, side='left') + rule['tdom']
+    in_range = (positions >= 0) & (positions < len(dates))
+    anchored = pd.DatetimeIndex(dates[np.clip(positions, 0, max(len(dates) - 1, 0))])
+    valid = in_range & (anchored.month == rule['month']) & (anchored.year == years)
+    return positions + rule['offset'], valid
+
+
+def rule_positions(dates, rule, years):
+    """
+    Session position in a sorted date index of a calendar rule for every year, in one
+    np.searchsorted; -1 for years where the rule lands outside its month.
+    """
+    positions, valid = _rule_positions(dates, rule, years)
+    return np.where(valid, positions, -1)
+
+
+def window_trades(dates, entry, exit):
+    """
+    Entry and exit session of every yearly window: in at the close of the entry session, out at
+    the close of the first exit session after it (in the following year when the exit comes
+    earlier in the calendar). Windows that are not complete within the dates, or whose entry or
+    exit rule lands outside its month that year, are dropped.
+    """
+    dates = pd.DatetimeIndex(dates)
+    years = np.arange(dates.year.min(), dates.year.max() + 1)
+    entries, entry_valid = _rule_positions(dates, entry, years)
+    exits_same, same_valid = _rule_positions(dates, exit, years)
+    exits_next, next_valid = _rule_positions(dates, exit, years + 1)
+    same_year = exits_same > entries
+    exits = np.where(same_year, exits_same, exits_next)
+    valid = (entry_valid & np.where(same_year, same_valid, next_valid)
+             & (entries >= 0) & (entries < len(dates)) & (exits < len(dates)) & (exits > entries))
+    return pd.DataFrame({
+        'year': years[valid],
+        'entry': entries[valid],
+        'exit': exits[valid],
+        'entryDate': dates[entries[valid]],
+        'exitDate': dates[exits[valid]],
+    })
+
+
+def backtest_windows(closes, entry, exit, cost_bps=0.0, risk_free_rate=0.01):
+    """
+    Yearly seasonal-window strategy on every column of a (dates x tickers) close table at once.
+
+    The strategy is long from the close of each entry session to the close of its exit session
+    and flat otherwise; cost_bps is charged on both the entry and the exit. The holding mask is
+    built from +1/-1 markers and a cumulative sum, and the equity curves are the exponential of
+    the cumulative log returns, so no loop runs over days, trades or tickers. Sharpe counts flat
+    days as zero return. Each ticker's closes are forward-filled between its first and last
+    price, so a missing session inside a window neither drops that day's move from the equity
+    curve nor makes it disagree with the trade return. A ticker not listed at a window's entry
+    skips that window.
+
+    Returns (summary, yearly, equity): SUMMARY_COLUMNS per ticker, (entry year x ticker) trade
+    returns in % and the growth-of-1 equity curves.
+    """
+    closes = closes.sort_index()
+    closes = closes.ffill().where(closes.bfill().notna())
+    values = closes.to_numpy(dtype=float)
+    n_days, n_tickers = values.shape
+    trades = window_trades(closes.index, entry, exit)
+    entries, exits = trades['entry'].to_numpy(), trades['exit'].to_numpy()
+
+    cost = np.log1p(-cost_bps / 10000)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        trade_returns = np.expm1(np.log(values[exits] / values[entries]) + 2 * cost)
+    traded = ~np.isnan(trade_returns)
+
+    markers = np.zeros((n_days + 1, n_tickers))
+    charges = np.zeros((n_days, n_tickers))
+    rows, cols = np.nonzero(traded)
+    np.add.at(markers, (entries[rows] + 1, cols), 1)
+    np.add.at(markers, (exits[rows] + 1, cols), -1)
+    np.add.at(charges, (entries[rows], cols), cost)
+    np.add.at(charges, (exits[rows], cols), cost)
+    held = np.cumsum(markers, axis=0)[:n_days] > 0
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        log_returns = np.log(values[1:] / values[:-1])
+    log_returns = np.vstack([np.zeros((1, n_tickers)), np.nan_to_num(log_returns, nan=0.0, posinf=0.0, neginf=0.0)])
+    strategy = np.where(held, log_returns, 0.0) + charges
+    equity = pd.DataFrame(np.exp(np.cumsum(strategy, axis=0)), index=closes.index, columns=closes.columns)
+
+    daily = np.expm1(strategy)
+    listed = ~np.isnan(values)
+    excess = np.where(listed, daily - risk_free_rate / 252, np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sharpe = np.sqrt(252) * np.nanmean(excess, axis=0) / np.nanstd(excess, axis=0, ddof=1)
+    drawdown = (equity / equity.cummax() - 1).min().to_numpy()
+    years_listed = listed.sum(axis=0) / 252
+    total = equity.iloc[-1].to_numpy()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cagr = np.where(years_listed > 0, total ** (1 / years_listed) - 1, np.nan)
+        win_rate = (trade_returns > 0).sum(axis=0) / traded.sum(axis=0) * 100
+
+    summary = pd.DataFrame({
+        'Total Return': (total - 1) * 100,
+        'CAGR': cagr * 100,
+        'Sharpe Ratio': sharpe,
+        'Max Drawdown': drawdown * 100,
+        'Trades': traded.sum(axis=0),
+        'Win Rate': win_rate,
+        'Avg Trade Return': np.nanmean(np.where(traded, trade_returns, np.nan), axis=0) * 100 if len(trades) else np.nan,
+        'Exposure': (held & listed).sum(axis=0) / np.maximum(listed.sum(axis=0), 1) * 100,
+    }, index=closes.columns)
+    yearly = pd.DataFrame(trade_returns * 100, index=pd.Index(trades['year'], name='year'), columns=closes.columns)
+    return summary[SUMMARY_COLUMNS], yearly, equity
+
+
+def load_closes(tickers, start=None, end=None, offline_mode=False):
+    """Adjusted closes of several tickers from the shared price store, aligned on their union of dates."""
+    series = {}
+    for ticker in tickers:
+        close = load_close(ticker, start, end, offline_mode=offline_mode)
+        if close.empty:
+            print(f"No data available for {ticker}.")
+            continue
+        series[ticker] = close
+    if not series:
+        return pd.DataFrame()
+    return pd.concat(series, axis=1, sort=True)
+
+
+def seasonal_window_backtest(tickers, entry, exit, start=None, end=None, cost_bps=0.0, risk_free_rate=0.01,
+                             offline_mode=False):
+    """backtest_windows over tickers loaded from the price store; e.g. buy gyms in November across a sector."""
+    closes = load_closes(tickers, start, end, offline_mode)
+    if closes.empty:
+        raise ValueError("No price data available for the requested tickers")
+    return backtest_windows(closes, entry, exit, cost_bps, risk_free_rate)
+
+
+def parse_rule(text):
+    """'11' -> {'month': 11}; 'month=10,tdom=-1,offset=2' -> the matching rule dict."""
+    if '=' not in text:
+        return {'month': int(text)}
+    return {key.strip(): int(value) for key, value in (part.split('=') for part in text.split(','))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest a yearly seasonal window across many tickers.")
+    parser.add_argument('tickers', nargs='+', help="Ticker symbols")
+    parser.add_argument('--entry', required=True, help="Entry rule, e.g. 11 or month=10,tdom=-1")
+    parser.add_argument('--exit', required=True, help="Exit rule, e.g. 1 or month=1,day=15,offset=-1")
+    parser.add_argument('--start', default=None, help="First date")
+    parser.add_argument('--end', default=None, help="Last date")
+    parser.add_argument('--cost-bps', type=float, default=0.0, help="Cost per side in basis points")
+    parser.add_argument('--offline', action='store_true', help="Use cached prices only")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_DIR, help="Directory for the CSV tables")
+    args = parser.parse_args()
+
+    tickers = list(dict.fromkeys(t.upper() for t in args.tickers))
+    summary, yearly, _ = seasonal_window_backtest(tickers, parse_rule(args.entry), parse_rule(args.exit), args.start,
+                                                  args.end, args.cost_bps, offline_mode=args.offline)
+    os.makedirs(args.output, exist_ok=True)
+    summary.to_csv(os.path.join(args.output, "seasonal_window_summary.csv"))
+    yearly.to_csv(os.path.join(args.output, "seasonal_window_yearly.csv"))
+    print(summary.sort_values('Sharpe Ratio', ascending=False).to_string(float_format='{:.2f}'.format))
+    print("\nTrade return (%) by entry year:")
+    print(yearly.to_string(float_format='{:.2f}'.format))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from price_store import load_prices
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".seasonality_cache")
+
+
+def cube_file(symbol):
+    """Parquet file holding a symbol's seasonality cube."""
+    return os.path.join(CACHE_DIR, symbol.upper().replace('^', '_') + '.parquet')
+
+
+def _countup(groups, dtype, partial_start):
+    """1-based trading day within each group; NaN throughout a first period the history starts partway into."""
+    count = (groups.cumcount() + 1).astype(dtype)
+    if partial_start:
+        group_id = groups.ngroup().to_numpy()
+        count[group_id == 0] = pd.NA
+    return count
+
+
+def _starts_partway(first_date, period_start):
+    """True when a history's first date comes after the first exchange session of its period."""
+    # Imported here: holiday_effects builds on this module
+    from holiday_effects import exchange_holidays
+    holidays = exchange_holidays(first_date.year, first_date.year).index.to_numpy(dtype='datetime64[D]')
+    first_session = np.busday_offset(np.datetime64(period_start.date(), 'D'), 0, roll='forward', holidays=holidays)
+    return np.datetime64(first_date.date(), 'D') > first_session
+
+
+def _countdown(groups, dates, period_end):
+    """Trading days left to the end of each group (0 on its last day); NaN for a final period still in progress."""
+    left = groups.cumcount(ascending=False).astype('Int16')
+    if period_end.rollforward(dates[-1]) > dates[-1]:
+        group_id = groups.ngroup().to_numpy()
+        left[group_id == group_id.max()] = pd.NA
+    return left
+
+
+def build_cube(prices, previous_close=None):
+    """
+    Daily returns of a price history tagged with every calendar key the seasonality tools group by.
+
+    ret is the daily % change of Adj Close and logRet its log return; tdom/tdoy are 1-based
+    trading-day-of-month/year, tdomToEnd/tdoyToEnd count the trading days left in the
+    month/year (NaN while the latest month/year is still in progress). tdom/tdoy are NaN for
+    the first month/year when the history starts partway into it (e.g. a listing mid-month),
+    as the sessions before the listing cannot be counted. previous_close seeds the first
+    return when the cube is rebuilt from the middle of the history, which always starts at a
+    year boundary.
+    """
+    close = prices['Adj Close'].where(prices['Adj Close'].notna(), prices['Close']).dropna()
+    dates = close.index
+    prior = close.shift(1)
+    if previous_close is not None and len(prior):
+        prior.iloc[0] = previous_close
+    index = pd.Series(np.arange(len(dates)), index=dates)
+    by_month = index.groupby([dates.year, dates.month])
+    by_year = index.groupby(dates.year)
+    history_start = previous_close is None and len(dates) > 0
+    partial_month = history_start and _starts_partway(dates[0], dates[0].replace(day=1))
+    partial_year = history_start and _starts_partway(dates[0], dates[0].replace(month=1, day=1))
+
+    cube = pd.DataFrame({
+        'close': close,
+        'ret': (close / prior - 1) * 100,
+        'logRet': np.log(close / prior),
+        'volume': prices['Volume'].reindex(dates),
+        'year': dates.year.astype('int16'),
+        'month': dates.month.astype('int8'),
+        'day': dates.day.astype('int8'),
+        'tdom': _countup(by_month, 'Int8', partial_month),
+        'tdomToEnd': _countdown(by_month, dates, pd.offsets.BMonthEnd()),
+        'doy': dates.dayofyear.astype('int16'),
+        'tdoy': _countup(by_year, 'Int16', partial_year),
+        'tdoyToEnd': _countdown(by_year, dates, pd.offsets.BYearEnd()),
+        'weekday': dates.weekday.astype('int8'),
+        'week': dates.isocalendar().week.astype('int8').to_numpy(),
+    }, index=dates)
+    cube.index.name = 'Date'
+    return cube
+
+
+def _closes_agree(kept, prices, sessions=5):
+    """
+    Whether the last cached closes still match the price store. They stop matching when a split
+    or dividend has re-adjusted the history, and the cube must then be rebuilt on the new basis.
+    """
+    if kept.empty:
+        return True
+    close = prices['Adj Close'].where(prices['Adj Close'].notna(), prices['Close'])
+    recent = kept['close'].iloc[-sessions:]
+    fresh = close.reindex(recent.index)
+    return fresh.notna().all() and np.allclose(recent.to_numpy(dtype=float), fresh.to_numpy(dtype=float), rtol=1e-4)
+
+
+def load_cube(symbol, offline_mode=False):
+    """
+    A symbol's seasonality cube, built once from the price store and then updated incrementally.
+
+    New prices only trigger a rebuild of the current calendar year (the trading-day counters of
+    that year depend on its newest rows); earlier years are read back from the cache untouched,
+    unless their last closes no longer match the price store, in which case the whole cube is
+    rebuilt from the re-adjusted history.
+    """
+    prices = load_prices(symbol, offline_mode=offline_mode)
+    path = cube_file(symbol)
+    cube = pd.read_parquet(path) if os.path.exists(path) else None
+    if prices.empty:
+        return cube
+    if cube is not None and len(cube) and cube.index.max() >= prices.index.max() and cube['tdom'].dtype == 'Int8':
+        return cube
+
+    # Cubes cached before tdom/tdoy became nullable still count a partial first period from 1
+    if cube is None or cube.empty or cube['tdom'].dtype != 'Int8':
+        cube = build_cube(prices)
+    else:
+        rebuild_from = pd.Timestamp(year=cube.index.max().year, month=1, day=1)
+        kept = cube[cube.index < rebuild_from]
+        if _closes_agree(kept, prices):
+            previous_close = kept['close'].iloc[-1] if len(kept) else None
+            cube = pd.concat([kept, build_cube(prices[prices.index >= rebuild_from], previous_close)])
+        else:
+            cube = build_cube(prices)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    cube.to_parquet(path)
+    return cube
+
+
+def select_years(cube, start_year=None, end_year=None, years=None):
+    """Rows of the cube for a year range and/or an explicit collection of years."""
+    mask = np.ones(len(cube), dtype=bool)
+    if start_year is not None:
+        mask &= cube['year'].to_numpy() >= start_year
+    if end_year is not None:
+        mask &= cube['year'].to_numpy() <= end_year
+    if years is not None:
+        mask &= cube['year'].isin(list(years)).to_numpy()
+    return cube[mask]
+
+
+def seasonal_pivot(cube, index, columns, value='ret', agg='mean', start_year=None, end_year=None):
+    """Any (index x columns) view of the cube, e.g. ('month', 'day') or ('year', 'weekday')."""
+    return select_years(cube, start_year, end_year).pivot_table(index=index, columns=columns, values=value, aggfunc=agg)
+
+
+def period_returns(cube, keys=('year', 'month')):
+    """Compounded % return of every period defined by the grouping keys (year x month by default)."""
+    grouped = cube.groupby(list(keys))['logRet'].sum()
+    return np.expm1(grouped) * 100
+
+
+def monthly_return_matrix(cube, start_year=None, end_year=None):
+    """Year x month table of compounded monthly % returns."""
+    return period_returns(select_years(cube, start_year, end_year)).unstack('month').reindex(columns=range(1, 13))
+
+
+def relative_volume(cube, window=63):
+    """Daily volume over the median of the previous `window` sessions; zero-volume days are NaN."""
+    volume = cube['volume'].where(cube['volume'] > 0)
+    return volume / volume.shift(1).rolling(window, min_periods=window // 2).median()
+
+
+def weekday_stats(cube, start_year=None, end_year=None):
+    """Mean, min and max daily % return per weekday, indexed by day name."""
+    stats = select_years(cube, start_year, end_year).groupby('weekday')['ret'].agg(['mean', 'min', 'max'])
+    stats.index = [pd.Timestamp(2024, 1, 1 + d).day_name() for d in stats.index]
+    return stats
@@ -0,0 +1,106 @@
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+from seasonality_cube import load_cube, select_years, relative_volume
+from holiday_effects import holiday_offsets
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Options'))
+from options_analytics import monthly_opex_mask
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.expanduser("~"), "seasonality_screens")
+PROFILE_KEYS = ('weekday', 'month', 'opexWeek', 'quarterEnd', 'holidayOffset')
+WEEKDAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+
+
+def opex_week_mask(dates):
+    """True for every session in the Monday-Friday week that holds the monthly (third-Friday) expiration."""
+    dates = pd.DatetimeIndex(dates)
+    fridays = dates + pd.to_timedelta(4 - dates.weekday, unit='D')
+    return monthly_opex_mask(fridays)
+
+
+def volume_frame(cube, window=63, max_offset=3):
+    """
+    Daily volume of one cube with relative volume (volume over the median of the previous
+    `window` sessions) and the calendar buckets the volume profiles group by.
+    """
+    month = cube['month'].to_numpy()
+    quarter_end = np.where(np.isin(month, [3, 6, 9, 12]) & (cube['tdomToEnd'].to_numpy(dtype=float, na_value=np.nan) < 5),
+                           cube['tdomToEnd'].to_numpy(dtype=float, na_value=np.nan), np.nan)
+    return pd.DataFrame({
+        'volume': cube['volume'].where(cube['volume'] > 0),
+        'relVolume': relative_volume(cube, window),
+        'weekday': cube['weekday'].to_numpy(),
+        'month': month,
+        'opexWeek': opex_week_mask(cube.index),
+        'quarterEnd': -quarter_end,
+        'holidayOffset': holiday_offsets(cube.index, max_offset=max_offset)['holidayOffset'].to_numpy(),
+    }, index=cube.index)
+
+
+def universe_volume_frame(cubes, window=63, max_offset=3, start_year=None):
+    """volume_frame of every cube in a {symbol: cube} mapping stacked into one long frame."""
+    frames = []
+    for symbol, cube in cubes.items():
+        if cube is None or cube.empty:
+            continue
+        frame = volume_frame(select_years(cube, start_year), window, max_offset)
+        frame.insert(0, 'symbol', symbol)
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames)
+
+
+def volume_profiles(frame, keys=PROFILE_KEYS):
+    """
+    Mean and median relative volume, plus session count, for every bucket of every key and symbol.
+
+    The keys are melted into (dimension, bucket) pairs so the whole universe is profiled in a
+    single groupby. quarterEnd buckets are sessions to quarter end (0 is the last session,
+    -1 the one before); holidayOffset buckets are sessions before (negative) or after an exchange
+    holiday from the rule-based calendar in holiday_effects.
+    """
+    data = frame.dropna(subset=['relVolume'])
+    long = data.melt(id_vars=['symbol', 'relVolume'], value_vars=list(keys), var_name='dimension', value_name='bucket')
+    long = long.dropna(subset=['bucket'])
+    long['bucket'] = long['bucket'].astype(int)
+    profile = long.groupby(['symbol', 'dimension', 'bucket'], sort=True)['relVolume'].agg(['mean', 'median', 'count'])
+    return profile.reset_index()
+
+
+def profile_table(profiles, dimension, value='mean'):
+    """Symbol x bucket view of one profile dimension."""
+    table = profiles[profiles['dimension'] == dimension].pivot(index='symbol', columns='bucket', values=value)
+    if dimension == 'weekday':
+        table.columns = [WEEKDAY_NAMES[int(d)] for d in table.columns]
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Relative-volume seasonality by weekday, month, OPEX week and holidays.")
+    parser.add_argument('symbols', nargs='+', help="Ticker symbols")
+    parser.add_argument('--start-year', type=int, default=None, help="First year of history")
+    parser.add_argument('--window', type=int, default=63, help="Sessions in the trailing median volume")
+    parser.add_argument('--online', action='store_true', help="Update each ticker's prices first")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_DIR, help="Directory for the profile CSV")
+    args = parser.parse_args()
+
+    symbols = list(dict.fromkeys(s.upper() for s in args.symbols))
+    cubes = {s: load_cube(s, offline_mode=not args.online) for s in symbols}
+    frame = universe_volume_frame(cubes, args.window, start_year=args.start_year)
+    if frame.empty:
+        print("No volume data available for the requested symbols.")
+        return
+    profiles = volume_profiles(frame)
+    os.makedirs(args.output, exist_ok=True)
+    profiles.to_csv(os.path.join(args.output, "volume_profiles.csv"), index=False)
+    for dimension in PROFILE_KEYS:
+        print(f"\nRelative volume by {dimension}:")
+        print(profile_table(profiles, dimension).to_string(float_format='{:.2f}'.format))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,61 +1,41 @@
-import yfinance as yf
-import pandas as pd
-import numpy as np
+import os
+import sys
+import argparse
 import matplotlib.pyplot as plt
 
-def get_data(ticker):
-    """Fetch historical data for a given ticker."""
-    return yf.download(ticker, start="2010-01-01", end="2024-01-01")
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Seasonality'))
+from seasonal_window import seasonal_window_backtest, parse_rule
 
-def backtest_strategy(data):
-    """Backtest the buy-in-November and sell-in-January strategy."""
-    data['Returns'] = data['Adj Close'].pct_change()
-    data['Month'] = data.index.month
-    data['Year'] = data.index.year
-    
-    signals = pd.DataFrame(index=data.index)
-    signals['Position'] = 0
-    
-    # Buy in November, sell in January
-    signals.loc[(data['Month'] == 11), 'Position'] = 1
-    signals.loc[(data['Month'] == 10), 'Position'] = 0
-    
-    # Forward fill the positions
-    signals['Position'] = signals['Position'].ffill().fillna(0)
-    
-    # Calculate strategy returns
-    signals['Strategy Returns'] = signals['Position'].shift(1) * data['Returns']
-    
-    return signals, data
+def backtest_strategy(tickers, entry, exit, start, end, cost_bps=0.0):
+    """Backtest the buy-in-November seasonal window for every ticker at once."""
+    return seasonal_window_backtest(tickers, entry, exit, start, end, cost_bps)
 
-def calculate_sharpe_ratio(returns, risk_free_rate=0.01):
-    """Calculate the annualized Sharpe ratio of the strategy."""
-    excess_returns = returns - risk_free_rate / 252
-    sharpe_ratio = np.sqrt(252) * excess_returns.mean() / excess_returns.std()
-    return sharpe_ratio
-
-def plot_results(data, signals, initial_investment=10000):
+def plot_results(summary, equity, entry, exit, initial_investment=10000):
     """Plot the performance of the strategy and show returns on initial investment."""
-    cumulative_returns = (1 + signals['Strategy Returns']).cumprod()
-    final_value = initial_investment * cumulative_returns[-1]
-    
-    cumulative_returns.plot(figsize=(10, 5))
-    plt.title('Strategy Performance, Buy Planet Fitness in Nov Sell in Jan')
+    equity.plot(figsize=(10, 5))
+    plt.title(f'Strategy Performance, Buy {entry} Sell {exit}')
     plt.ylabel('Cumulative Returns')
     plt.show()
-    
-    print(f'Final value of ${initial_investment} investment: ${final_value:.2f}')
-
-# Fetch data
-ticker = 'PLNT'
-data = get_data(ticker)
-
-# Backtest strategy
-signals, data = backtest_strategy(data)
-
-# Calculate Sharpe ratio
-sharpe_ratio = calculate_sharpe_ratio(signals['Strategy Returns'])
-print(f'Sharpe Ratio: {sharpe_ratio}')
 
-# Plot results and show final investment value
-plot_results(data, signals, initial_investment=10000)
+    for ticker, row in summary.iterrows():
+        final_value = initial_investment * equity[ticker].iloc[-1]
+        print(f'{ticker}: Sharpe Ratio {row["Sharpe Ratio"]:.2f}, Max Drawdown {row["Max Drawdown"]:.2f}%, '
+              f'Final value of ${initial_investment} investment: ${final_value:.2f}')
+
+def main():
+    parser = argparse.ArgumentParser(description="New Year's resolution trade: buy gyms in November.")
+    parser.add_argument('tickers', nargs='*', default=['PLNT'], help="Ticker symbols")
+    parser.add_argument('--entry', default='11', help="Entry rule, e.g. 11 or month=10,tdom=-1")
+    parser.add_argument('--exit', default='12', help="Exit rule, e.g. 1 or month=1,day=15")
+    parser.add_argument('--start', default='2010-01-01', help="First date")
+    parser.add_argument('--end', default='2024-01-01', help="Last date")
+    parser.add_argument('--cost-bps', type=float, default=0.0, help="Cost per side in basis points")
+    args = parser.parse_args()
+
+    summary, yearly, equity = backtest_strategy(args.tickers, parse_rule(args.entry), parse_rule(args.exit),
+                                                args.start, args.end, args.cost_bps)
+    print(yearly.round(2))
+    plot_results(summary, equity, args.entry, args.exit, initial_investment=10000)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from price_store import load_close
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.expanduser("~"), "vix_levels")
+
+
+def distribution_stats(values):
+    """Mean, median, mode (of closes rounded to cents), std, min, max and latest close of a series."""
+    values = pd.Series(values).dropna()
+    rounded, counts = np.unique(np.round(values.to_numpy(dtype=float), 2), return_counts=True)
+    return {
+        'mostRecentClose': values.iloc[-1],
+        'mean': values.mean(),
+        'median': values.median(),
+        'mode': rounded[counts.argmax()],
+        'std': values.std(ddof=0),
+        'min': values.min(),
+        'max': values.max(),
+        'totalDays': len(values),
+    }
+
+
+def threshold_table(values, thresholds, horizons=(5, 21, 63), target=None):
+    """
+    Above/below counts and conditional forward returns for many thresholds at once.
+
+    The series is sorted once; each threshold's split point comes from np.searchsorted and
+    every conditional mean is a difference of prefix sums over the sorted forward returns,
+    so the cost is O(n log n + len(thresholds)) whatever the number of thresholds.
+    Forward returns are of `target` (a price Series, defaults to the level series itself)
+    over each horizon in trading days; 'Above' means strictly greater than the threshold.
+    """
+    values = pd.Series(values).dropna()
+    target = values if target is None else pd.Series(target).reindex(values.index).ffill()
+    thresholds = np.asarray(thresholds, dtype=float)
+    order = np.argsort(values.to_numpy(), kind='stable')
+    sorted_values = values.to_numpy()[order]
+    n = len(sorted_values)
+    below = np.searchsorted(sorted_values, thresholds, side='right')
+    above = n - below
+
+    table = pd.DataFrame({
+        'threshold': thresholds,
+        'daysAbove': above,
+        'daysBelowOrEqual': below,
+        'pctAbove': above / n * 100,
+        'pctBelowOrEqual': below / n * 100,
+    })
+    prices = target.to_numpy(dtype=float)
+    for h in horizons:
+        forward = np.full(n, np.nan)
+        forward[:-h] = prices[h:] / prices[:-h] - 1
+        forward = forward[order]
+        valid = ~np.isnan(forward)
+        sums = np.concatenate([[0.0], np.cumsum(np.where(valid, forward, 0.0))])
+        counts = np.concatenate([[0], np.cumsum(valid)])
+        below_n, above_n = counts[below], counts[-1] - counts[below]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            table[f'fwd{h}dAbove'] = (sums[-1] - sums[below]) / above_n * 100
+            table[f'fwd{h}dBelowOrEqual'] = sums[below] / below_n * 100
+    return table
+
+
+def histogram_data(values, bin_width=1.0, floor=8.0, ceiling=None):
+    """Histogram of the series as a table; with a ceiling, everything above it lands in the last bin."""
+    values = pd.Series(values).dropna().to_numpy(dtype=float)
+    top = ceiling if ceiling is not None else values.max()
+    if ceiling is not None:
+        values = np.minimum(values, ceiling)
+    edges = np.arange(np.floor(min(values.min(), floor)), top + 2 * bin_width, bin_width)
+    counts, edges = np.histogram(values, bins=edges)
+    return pd.DataFrame({
+        'binLeft': edges[:-1],
+        'binRight': edges[1:],
+        'count': counts,
+        'pct': counts / len(values) * 100,
+    })
+
+
+def parse_thresholds(text):
+    """'12,15,20' -> [12, 15, 20]; 'start:stop:step' -> inclusive range."""
+    if ':' in text:
+        start, stop, step = (float(x) for x in text.split(':'))
+        return [float(x) for x in np.round(np.arange(start, stop + step / 2, step), 6)]
+    return [float(x) for x in text.split(',') if x.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless VIX level statistics and threshold sweep.")
+    parser.add_argument('--thresholds', default='10:50:1', help="Comma list or start:stop:step (default 10:50:1)")
+    parser.add_argument('--horizons', default='5,21,63', help="Forward-return horizons in trading days")
+    parser.add_argument('--symbol', default='^VIX', help="Level series to analyze")
+    parser.add_argument('--target', default=None, help="Symbol whose forward returns are conditioned on (default: the level series)")
+    parser.add_argument('--ceiling', type=float, default=None, help="Cap the histogram at this value")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_DIR, help="Directory for the CSV tables")
+    parser.add_argument('--offline', action='store_true', help="Use cached prices only")
+    args = parser.parse_args()
+
+    values = load_close(args.symbol, offline_mode=args.offline)
+    if values.empty:
+        print("No data found for the specified symbol.")
+        return
+    target = load_close(args.target, offline_mode=args.offline) if args.target else None
+    horizons = [int(h) for h in args.horizons.split(',')]
+
+    stats = distribution_stats(values)
+    table = threshold_table(values, parse_thresholds(args.thresholds), horizons, target)
+    histogram = histogram_data(values, ceiling=args.ceiling)
+
+    os.makedirs(args.output, exist_ok=True)
+    stamp = f"{values.index[-1]:%Y-%m-%d}"
+    pd.DataFrame([stats]).to_csv(os.path.join(args.output, f"vix_stats_{stamp}.csv"), index=False)
+    table.to_csv(os.path.join(args.output, f"vix_thresholds_{stamp}.csv"), index=False)
+    histogram.to_csv(os.path.join(args.output, f"vix_histogram_{stamp}.csv"), index=False)
+
+    print(", ".join(f"{k}: {v:.2f}" if isinstance(v, float) else f"{k}: {v}" for k, v in stats.items()))
+    print(table.to_string(index=False, float_format='{:.2f}'.format))
+
+
+if __name__ == "__main__":
+    main()
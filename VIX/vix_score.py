@@ -0,0 +1,132 @@
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from price_store import load_close
+
+STRESS_EVENTS = {
+    "2008 Crisis": 80,
+    "COVID-19": 82,
+    "Dot-com Bubble": 77,
+}
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.expanduser("~"), "vix_levels")
+
+
+def expanding_percentile_rank(values):
+    """
+    Percentile rank of each value among all values up to and including it.
+
+    Matches scipy.stats.percentileofscore(values[:i + 1], values[i]) (kind='rank') for every i,
+    but keeps the history in a Fenwick tree over the value ranks, so the whole series costs
+    O(n log n) instead of n full scans.
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    uniques, codes = np.unique(values, return_inverse=True)
+    tree = np.zeros(len(uniques) + 1, dtype=np.int64)
+
+    def count_upto(i):  # number of stored values with rank code < i
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    ranks = np.empty(n)
+    for t, code in enumerate(codes):
+        i = code + 1
+        while i <= len(uniques):
+            tree[i] += 1
+            i += i & -i
+        below = count_upto(code)
+        at_or_below = count_upto(code + 1)
+        ranks[t] = (below + at_or_below + 1) * 50.0 / (t + 1)
+    return ranks
+
+
+def composite_scores(close, rolling_window=21, min_history=252):
+    """
+    VIX composite value score for every day, using only the closes available on that day.
+
+    Full-sample statistics of (Production) VIX_Score.py become expanding ones: percentile rank,
+    mean and std over all closes up to the day, plus the rolling 21-day z-score. The last row
+    equals what the production script prints for the same history. Days with fewer than
+    min_history closes are left NaN.
+    """
+    close = pd.Series(close).dropna()
+    mean = close.expanding().mean()
+    std = close.expanding().std()
+    percentile = pd.Series(expanding_percentile_rank(close.to_numpy()), index=close.index)
+    z_score = (close - mean) / std
+    rolling_z = (close - close.rolling(rolling_window).mean()) / close.rolling(rolling_window).std()
+    reversion = (close - mean).abs() / std
+    stress = 100 - np.abs(percentile.to_numpy()[:, None] - np.array(list(STRESS_EVENTS.values()))[None, :]).min(axis=1)
+    outside_ci = (close < mean - 1.0 * std) | (close > mean + 2.0 * std)
+    sharpe = (mean - close) / std
+
+    # Weights by volatility regime, as in the production script
+    w1 = np.select([close > 25, close < 15], [0.3, 0.5], 0.4)
+    w2 = np.select([close > 25, close < 15], [0.5, 0.3], 0.4)
+    w3, w4, w5 = 0.1, 0.1, 0.0
+
+    score = (
+        w1 * (100 - percentile) +
+        w2 * np.maximum(1 - z_score.abs(), 0) * 100 +
+        w3 * (1 / (1 + reversion)) * 100 +
+        w4 * stress +
+        w5 * sharpe * 10 +
+        np.where(outside_ci, -10, 0)
+    )
+    scores = pd.DataFrame({
+        'close': close,
+        'percentileRank': percentile,
+        'zScore': z_score,
+        'rollingZScore': rolling_z,
+        'meanReversion': reversion,
+        'stressAdjusted': stress,
+        'compositeScore': score,
+    })
+    scores.iloc[:min_history - 1, 1:] = np.nan
+    return scores
+
+
+def score_forward_returns(scores, target, horizons=(5, 21, 63), bins=(0, 40, 70, 100)):
+    """Mean forward return of a price series (%) and day count per composite-score band."""
+    target = pd.Series(target).reindex(scores.index).ffill()
+    bands = pd.cut(scores['compositeScore'], bins=[-np.inf, *bins[1:-1], np.inf],
+                   labels=[f'{lo}-{hi}' for lo, hi in zip(bins[:-1], bins[1:])])
+    table = {'days': scores['compositeScore'].groupby(bands, observed=False).count()}
+    for h in horizons:
+        forward = (target.shift(-h) / target - 1) * 100
+        table[f'fwd{h}d'] = forward.groupby(bands, observed=False).mean()
+    return pd.DataFrame(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-history daily VIX composite score.")
+    parser.add_argument('--target', default='^GSPC', help="Symbol whose forward returns are tabulated by score band")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_DIR, help="Directory for the score CSV")
+    parser.add_argument('--offline', action='store_true', help="Use cached prices only")
+    args = parser.parse_args()
+
+    close = load_close('^VIX', start='1990-01-01', column='Close', offline_mode=args.offline)
+    if close.empty:
+        print("No data found for ^VIX.")
+        return
+    scores = composite_scores(close)
+    os.makedirs(args.output, exist_ok=True)
+    scores.to_csv(os.path.join(args.output, "vix_composite_scores.csv"))
+
+    print(f"Current VIX closing price: {scores['close'].iloc[-1]:.2f}")
+    print(f"Composite value score: {scores['compositeScore'].iloc[-1]:.2f}")
+    if args.target:
+        target = load_close(args.target, start='1990-01-01', offline_mode=args.offline)
+        print(f"\nForward {args.target} returns (%) by composite score band:")
+        print(score_forward_returns(scores, target).round(2).to_string())
+
+
+if __name__ == "__main__":
+    main()
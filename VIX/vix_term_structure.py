@@ -0,0 +1,124 @@
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from price_store import OVERLAP_DAYS, load_close
+from reversion import reversion_episodes
+from vix_levels import DEFAULT_OUTPUT_DIR, threshold_table
+
+TERM_SYMBOLS = {'VIX9D': '^VIX9D', 'VIX': '^VIX', 'VIX3M': '^VIX3M', 'VIX6M': '^VIX6M'}
+RATIO_THRESHOLDS = (0.8, 0.85, 0.9, 0.95, 1.0, 1.05, 1.1, 1.2)
+
+
+def load_term_structure(offline_mode=False):
+    """Aligned daily closes of VIX9D, VIX, VIX3M and VIX6M; rows start once both VIX and VIX3M exist."""
+    curve = pd.concat([load_close(symbol, column='Close', offline_mode=offline_mode).rename(name)
+                       for name, symbol in TERM_SYMBOLS.items()], axis=1, sort=True)
+    return curve.dropna(subset=['VIX', 'VIX3M'])
+
+
+def term_structure_metrics(curve):
+    """
+    Row-wise term-structure measures: adjacent-tenor ratios, 3M-minus-spot slope and the
+    contango/backwardation state of VIX/VIX3M (ratio above 1 is backwardation).
+    """
+    metrics = curve.copy()
+    metrics['VIX9D/VIX'] = curve['VIX9D'] / curve['VIX']
+    metrics['VIX/VIX3M'] = curve['VIX'] / curve['VIX3M']
+    metrics['VIX3M/VIX6M'] = curve['VIX3M'] / curve['VIX6M']
+    metrics['slope3M'] = curve['VIX3M'] - curve['VIX']
+    metrics['backwardation'] = metrics['VIX/VIX3M'] > 1
+    metrics['frontInverted'] = metrics['VIX9D/VIX'] > 1
+    return metrics
+
+
+def update_term_structure_history(offline_mode=False, output_dir=DEFAULT_OUTPUT_DIR):
+    """
+    Bring the stored term-structure table up to date and return it.
+
+    Prices come from the shared incremental price store. The last OVERLAP_DAYS stored rows
+    are recomputed on every update, so a row written before the day's close settled is
+    revised, and new dates are appended, next to the other VIX outputs in output_dir. If the
+    older stored closes no longer match the price store (a revised source history), the whole
+    table is recomputed instead.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, "vix_term_structure.csv")
+    history = pd.read_csv(path, index_col=0, parse_dates=True) if os.path.exists(path) else None
+    curve = load_term_structure(offline_mode)
+    if curve.empty:
+        return history
+    if history is not None and len(history):
+        kept = history.iloc[:-OVERLAP_DAYS]
+        stored = kept[list(TERM_SYMBOLS)].to_numpy(dtype=float)
+        source = curve.reindex(kept.index)[list(TERM_SYMBOLS)].to_numpy(dtype=float)
+        if np.allclose(stored, source, rtol=1e-4, equal_nan=True):
+            history = kept
+            curve = curve[curve.index > kept.index.max()] if len(kept) else curve
+        else:
+            print("Stored VIX term structure no longer matches the price history; recomputing it.")
+            history = None
+
+    new = term_structure_metrics(curve)
+    history = new if history is None or history.empty else pd.concat([history, new])
+    history.index.name = 'Date'
+    history.to_csv(path)
+    return history
+
+
+def backwardation_episodes(metrics):
+    """Backwardation spells: from the first close with VIX/VIX3M > 1 to the first close back below 1."""
+    return reversion_episodes(metrics['VIX/VIX3M'], 1.0, 1.0, side='above')
+
+
+def backwardation_summary(metrics, episodes):
+    """Share of days in backwardation and episode duration statistics."""
+    resolved = episodes[episodes['resolved']]
+    current = episodes[~episodes['resolved']]
+    return {
+        'days': len(metrics),
+        'pctBackwardation': metrics['backwardation'].mean() * 100,
+        'pctFrontInverted': metrics['frontInverted'][metrics['VIX9D'].notna()].mean() * 100,
+        'episodes': len(resolved),
+        'meanSessions': resolved['sessions'].mean(),
+        'medianSessions': resolved['sessions'].median(),
+        'maxSessions': resolved['sessions'].max(),
+        'inBackwardationSince': current['entryDate'].iloc[0] if len(current) else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VIX term-structure state, episodes and conditional SPX returns.")
+    parser.add_argument('--target', default='^GSPC', help="Symbol whose forward returns are conditioned on VIX/VIX3M")
+    parser.add_argument('--horizons', default='5,21,63', help="Forward-return horizons in trading days")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_DIR, help="Directory for the stored tables")
+    parser.add_argument('--offline', action='store_true', help="Use cached prices only")
+    args = parser.parse_args()
+
+    metrics = update_term_structure_history(args.offline, args.output)
+    if metrics is None or metrics.empty:
+        print("No term-structure data available.")
+        return
+    episodes = backwardation_episodes(metrics)
+    episodes.to_csv(os.path.join(args.output, "vix_backwardation_episodes.csv"), index=False)
+
+    latest = metrics.iloc[-1]
+    state = 'Backwardation' if latest['backwardation'] else 'Contango'
+    print(f"{metrics.index[-1]:%Y-%m-%d}  VIX9D {latest['VIX9D']:.2f}  VIX {latest['VIX']:.2f}  "
+          f"VIX3M {latest['VIX3M']:.2f}  VIX6M {latest['VIX6M']:.2f}")
+    print(f"VIX/VIX3M {latest['VIX/VIX3M']:.3f} ({state}), VIX9D/VIX {latest['VIX9D/VIX']:.3f}, VIX3M/VIX6M {latest['VIX3M/VIX6M']:.3f}")
+    for key, value in backwardation_summary(metrics, episodes).items():
+        print(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}")
+
+    target = load_close(args.target, offline_mode=args.offline)
+    table = threshold_table(metrics['VIX/VIX3M'], RATIO_THRESHOLDS, [int(h) for h in args.horizons.split(',')], target)
+    table.to_csv(os.path.join(args.output, "vix_term_structure_returns.csv"), index=False)
+    print(f"\nForward {args.target} returns (%) by VIX/VIX3M threshold:")
+    print(table.to_string(index=False, float_format='{:.2f}'.format))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import os
+import argparse
+import numpy as np
+import pandas as pd
+from price_store import load_close
+
+EVENT_DIR = os.path.join(os.path.expanduser("~"), ".event_lists")
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.expanduser("~"), "event_studies")
+
+BUILTIN_EVENTS = {
+    'first_rate_cuts': [
+        "1987-10-20", "1989-07-06", "1991-07-02", "1995-07-06", "1998-09-29",
+        "2001-01-03", "2007-09-18", "2008-12-16", "2019-07-31", "2020-03-03",
+    ],
+}
+
+
+def event_file(name):
+    """CSV file holding a stored event list."""
+    return os.path.join(EVENT_DIR, f"{name}.csv")
+
+
+def save_events(name, dates, labels=None):
+    """Store an event list (dates plus optional labels) under a name for later studies."""
+    events = pd.DataFrame({'date': pd.to_datetime(list(dates))})
+    events['label'] = list(labels) if labels is not None else ''
+    os.makedirs(EVENT_DIR, exist_ok=True)
+    events.sort_values('date').to_csv(event_file(name), index=False)
+    return events
+
+
+def load_events(name):
+    """A stored event list, or one of the built-in lists; dates as a DatetimeIndex."""
+    path = event_file(name)
+    if os.path.exists(path):
+        return pd.DatetimeIndex(pd.read_csv(path, parse_dates=['date'])['date'])
+    if name in BUILTIN_EVENTS:
+        return pd.DatetimeIndex(BUILTIN_EVENTS[name])
+    raise ValueError(f"No event list named '{name}' in {EVENT_DIR} or the built-in lists")
+
+
+def align_events(index, dates, side='next', max_gap_days=None):
+    """
+    Position in a sorted trading-day index of every date, in one np.searchsorted.
+
+    side='next' maps a date to the first session on or after it, side='previous' to the last
+    session on or before it. Dates outside the index map to -1. With max_gap_days, a match
+    more than that many calendar days away from the date (a gap in the history) is -1 too.
+    """
+    index = pd.DatetimeIndex(index).to_numpy()
+    dates = pd.DatetimeIndex(dates).to_numpy()
+    if side == 'next':
+        positions = np.searchsorted(index, dates, side='left')
+        valid = (positions < len(index)) & (dates >= index[0]) if len(index) else np.zeros(len(dates), dtype=bool)
+    elif side == 'previous':
+        positions = np.searchsorted(index, dates, side='right') - 1
+        valid = (positions >= 0) & (dates <= index[-1]) if len(index) else np.zeros(len(dates), dtype=bool)
+    else:
+        raise ValueError("side must be 'next' or 'previous'")
+    if max_gap_days is not None and len(index):
+        matched = index[np.clip(positions, 0, len(index) - 1)]
+        valid &= np.abs(matched - dates) <= np.timedelta64(max_gap_days, 'D')
+    return np.where(valid, positions, -1)
+
+
+def event_returns(close, dates, horizons, unit='sessions', max_gap_days=7):
+    """
+    (events x horizons) % change from each event's close to the close `horizon` later.
+
+    Events are aligned to the first session on or after their date; events before the history
+    starts, or with no session within max_gap_days after them, are NaN rows rather than being
+    measured from a later listing date. With unit='sessions' a horizon counts trading sessions;
+    with unit='days' it counts calendar days and the target date is aligned to the first
+    session on or after it (the last session on or before it for negative horizons). Negative horizons give the path before the event relative to
+    the event close. Horizons that fall outside the history are NaN.
+    """
+    close = close.dropna()
+    values = close.to_numpy(dtype=float)
+    dates = pd.DatetimeIndex(dates)
+    horizons = np.asarray(horizons, dtype=int)
+    start = align_events(close.index, dates, 'next', max_gap_days)
+
+    if unit == 'sessions':
+        target = start[:, None] + horizons[None, :]
+    elif unit == 'days':
+        targets = dates.to_numpy()[:, None] + horizons[None, :].astype('timedelta64[D]')
+        target = np.where(horizons[None, :] >= 0,
+                          align_events(close.index, targets.ravel(), 'next').reshape(targets.shape),
+                          align_events(close.index, targets.ravel(), 'previous').reshape(targets.shape))
+    else:
+        raise ValueError("unit must be 'sessions' or 'days'")
+
+    valid = (start[:, None] >= 0) & (target >= 0) & (target < len(values))
+    returns = np.full(target.shape, np.nan)
+    rows, cols = np.nonzero(valid)
+    returns[rows, cols] = (values[target[rows, cols]] / values[start[rows]] - 1) * 100
+    return pd.DataFrame(returns, index=pd.Index(dates, name='event'), columns=pd.Index(horizons, name=unit))
+
+
+def unconditional_returns(close, horizons, unit='sessions'):
+    """Average % change over each horizon from every session in the history (the no-event baseline)."""
+    close = close.dropna()
+    return event_returns(close, close.index, horizons, unit).mean()
+
+
+def event_summary(returns, baseline=None):
+    """Mean, median, hit rate (% of events up) and count per horizon; excess over a baseline if given."""
+    summary = pd.DataFrame({
+        'mean': returns.mean(),
+        'median': returns.median(),
+        'hitRate': (returns > 0).sum() / returns.notna().sum() * 100,
+        'count': returns.notna().sum(),
+    })
+    if baseline is not None:
+        summary['baseline'] = baseline
+        summary['excess'] = summary['mean'] - baseline
+    return summary
+
+
+def event_study(symbol, dates, horizons, unit='sessions', benchmark=None, offline_mode=False):
+    """
+    Event returns of a symbol plus a summary against its unconditional average, and optionally
+    against a benchmark symbol over the very same event windows.
+
+    Returns (returns, summary); with a benchmark, summary gains benchmark and relative columns.
+    """
+    close = load_close(symbol, offline_mode=offline_mode)
+    if close.empty:
+        raise ValueError(f"No price data available for {symbol}")
+    returns = event_returns(close, dates, horizons, unit)
+    summary = event_summary(returns, unconditional_returns(close, horizons, unit))
+    if benchmark is not None:
+        benchmark_returns = event_returns(load_close(benchmark, offline_mode=offline_mode), dates, horizons, unit)
+        benchmark_returns = benchmark_returns.where(returns.notna())  # compare over the same events only
+        summary['benchmark'] = benchmark_returns.mean()
+        summary['relative'] = (returns - benchmark_returns).mean()
+    return returns, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Forward and backward returns around a list of event dates.")
+    parser.add_argument('events', help="Name of a stored or built-in event list, or comma-separated dates")
+    parser.add_argument('--symbol', default='^GSPC', help="Symbol to study")
+    parser.add_argument('--benchmark', default=None, help="Symbol to compare over the same windows")
+    parser.add_argument('--horizons', default='-21,-5,5,21,63,126,252', help="Comma-separated horizons")
+    parser.add_argument('--unit', choices=('sessions', 'days'), default='sessions', help="Horizon unit")
+    parser.add_argument('--save-as', default=None, help="Store the comma-separated dates under this name")
+    parser.add_argument('--offline', action='store_true', help="Use cached prices only")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_DIR, help="Directory for the CSV tables")
+    args = parser.parse_args()
+
+    if ',' in args.events or args.events[:1].isdigit():
+        dates = pd.DatetimeIndex(pd.to_datetime(args.events.split(',')))
+        name = args.save_as or 'custom'
+        if args.save_as:
+            save_events(args.save_as, dates)
+    else:
+        dates = load_events(args.events)
+        name = args.events
+
+    horizons = [int(h) for h in args.horizons.split(',')]
+    returns, summary = event_study(args.symbol, dates, horizons, args.unit, args.benchmark, args.offline)
+    os.makedirs(args.output, exist_ok=True)
+    stem = f"{name}_{args.symbol.replace('^', '')}_{args.unit}"
+    returns.to_csv(os.path.join(args.output, f"{stem}_returns.csv"))
+    summary.to_csv(os.path.join(args.output, f"{stem}_summary.csv"))
+
+    print(f"{args.symbol} % change around {len(dates)} '{name}' events (horizons in {args.unit}):")
+    print(returns.to_string(float_format='{:.2f}'.format))
+    print()
+    print(summary.to_string(float_format='{:.2f}'.format))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,24 @@
-import yfinance as yf
+import os
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from price_store import load_close
+from reversion import reversion_episodes
+
 # Fetch historical data for ^VIX
-vix_data = yf.download('^VIX', start='1990-01-01')
+vix_close = load_close('^VIX', start='1990-01-01', column='Close')
 
 # Define the spike threshold and the median level
 spike_threshold = 35
 median_level = 17.6
 
-# Find dates where VIX spiked above the threshold
-spike_dates = vix_data[vix_data['Close'] > spike_threshold].index
-
-# Calculate the number of trading sessions it took to return to the median level after each spike
-sessions_to_median = []
-for spike_date in spike_dates:
-    # Find the first date after the spike where VIX closes below the median level
-    post_spike_data = vix_data[spike_date:]
-    below_median_date = post_spike_data[post_spike_data['Close'] < median_level].index
-    if len(below_median_date) > 0:
-        sessions_count = (below_median_date[0] - spike_date).days
-        sessions_to_median.append((spike_date.strftime('%m/%d/%Y'), sessions_count))
+# Trading sessions from each spike episode (consecutive closes above the threshold that revert
+# together) to the first close below the median level
+episodes = reversion_episodes(vix_close, spike_threshold, median_level, side='above')
+episodes = episodes[episodes['resolved']]
+sessions_to_median = [(d.strftime('%m/%d/%Y'), int(n)) for d, n in zip(episodes['entryDate'], episodes['sessions'])]
 
 # Sort the results by the number of sessions
 sessions_to_median.sort(key=lambda x: x[1], reverse=True)
@@ -1,11 +1,17 @@
 new_url = 'https://www.optionsprofitcalculator.com/ajax/getOptions?stock={}&reqId=1'
+quote_url = 'https://query1.finance.yahoo.com/v8/finance/chart/{}?range=1d&interval=1d'
 
 
 
 import asyncio
 import aiohttp
 import json
+import datetime
+import threading
+import time
+import concurrent.futures
 import numpy as np
+from scipy.stats import norm
 
 def OpTable(x):
     hold = ''
@@ -15,33 +21,188 @@ def OpTable(x):
 
 class OptionsData:
 
-    def __init__(self, price=501.20, ticker='SPY'):
+    def __init__(self, price=None, ticker='SPY'):
         self.ticker = ticker
         self.stock_price = price
+        self.chains = {}
+        self.expirations = []
         self.call_strikes = []
         self.put_strikes = []
         self.call_prices = []
         self.put_prices = []
-
-    def fetcher(self):
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(self.fetch_data())
-
-    async def fetch_data(self):
-        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=False)) as session:
-            async with session.get(new_url.format(self.ticker)) as response:
-                r = await response.text()
-                r = json.loads(r)
-                date = list(r['options'].keys())[0]
-                call = r['options'][date]['c']
-                put = r['options'][date]['p']
-                for K, items in call.items():
-                    self.call_strikes.append(float(K))
-                    self.call_prices.append(float(items['l']))
-                for K, items in put.items():
-                    self.put_strikes.append(float(K))
-                    self.put_prices.append(float(items['l']))
-                
+        self.expiration = None
+
+    def select(self, expiration):
+        """Point the strike/price lists at one of the already fetched expirations."""
+        self.expiration = expiration
+        self.call_strikes, self.call_prices, self.put_strikes, self.put_prices = self.chains[expiration]
+
+    def yearsToExpiry(self):
+        try:
+            expiry = datetime.datetime.strptime(self.expiration, '%Y-%m-%d')
+        except (TypeError, ValueError):
+            return 30/365
+        return max((expiry - datetime.datetime.now()).total_seconds(), 0) / (365*24*3600)
+
+    def parityPrice(self):
+        """Spot implied by put-call parity at the strike where call and put prices are closest."""
+        calls = dict(zip(self.call_strikes, self.call_prices))
+        common = np.array([K for K in self.put_strikes if K in calls])
+        if common.size == 0:
+            return None
+        C = np.array([calls[K] for K in common])
+        P = np.array([dict(zip(self.put_strikes, self.put_prices))[K] for K in common])
+        i = np.abs(C - P).argmin()
+        return round(float(common[i] + C[i] - P[i]), 2)
+
+    async def fetch_data(self, session):
+        async with session.get(new_url.format(self.ticker)) as response:
+            r = json.loads(await response.text())
+        for date, chain in r['options'].items():
+            calls = sorted((float(K), float(items['l'])) for K, items in chain['c'].items())
+            puts = sorted((float(K), float(items['l'])) for K, items in chain['p'].items())
+            self.chains[date] = ([K for K, _ in calls], [p for _, p in calls],
+                                 [K for K, _ in puts], [p for _, p in puts])
+        self.expirations = list(self.chains)
+        self.select(self.expirations[0])
+
+        try:
+            async with session.get(quote_url.format(self.ticker), headers={'User-Agent': 'Mozilla/5.0'}) as response:
+                quote = await response.json(content_type=None)
+            self.stock_price = float(quote['chart']['result'][0]['meta']['regularMarketPrice'])
+        except (aiohttp.ClientError, KeyError, IndexError, TypeError, ValueError):
+            self.stock_price = self.parityPrice()
+
+
+class ChainFetcher:
+    """
+    Runs an asyncio loop in a daemon thread so HTTP requests never block Tk's mainloop.
+    One aiohttp session is reused for every request and fetched chains are cached per
+    ticker for `ttl` seconds, with all expirations kept so switching dates needs no refetch.
+    """
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self.cache = {}
+        self.session = None
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+
+    async def _fetch(self, ticker):
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=False))
+        data = OptionsData(ticker=ticker)
+        await data.fetch_data(self.session)
+        self.cache[ticker] = (time.time(), data)
+        return data
+
+    def fetch(self, ticker):
+        """Return a Future resolving to OptionsData; fresh cache hits resolve immediately."""
+        hit = self.cache.get(ticker)
+        if hit is not None and time.time() - hit[0] < self.ttl:
+            future = concurrent.futures.Future()
+            future.set_result(hit[1])
+            return future
+        return asyncio.run_coroutine_threadsafe(self._fetch(ticker), self.loop)
+
+    def close(self):
+        if self.session is not None:
+            asyncio.run_coroutine_threadsafe(self.session.close(), self.loop).result(timeout=5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+def BlackScholes(S, K, T, v, r, phi):
+    """Black-Scholes value broadcast over any mix of arrays; phi is +1 for calls and -1 for puts."""
+    T = np.maximum(T, 0)
+    sqrtT = np.sqrt(T)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d1 = (np.log(S/K) + (r + 0.5*v*v)*T)/(v*sqrtT)
+        d2 = d1 - v*sqrtT
+        value = phi*(S*norm.cdf(phi*d1) - K*np.exp(-r*T)*norm.cdf(phi*d2))
+    return np.where(T > 0, np.nan_to_num(value), np.maximum(phi*(S - K), 0))
+
+
+def ImpliedVol(price, S, K, T, r, phi, low=1e-4, high=5.0, steps=60):
+    """Vectorized bisection for the volatility that reprices every leg at once."""
+    low = np.full(np.shape(price), low)
+    high = np.full(np.shape(price), high)
+    for _ in range(steps):
+        mid = 0.5*(low + high)
+        above = BlackScholes(S, K, T, mid, r, phi) > price
+        high = np.where(above, mid, high)
+        low = np.where(above, low, mid)
+    return 0.5*(low + high)
+
+
+class Strategy:
+    """
+    Multi-leg option position held as parallel arrays (one entry per leg), so payoffs,
+    mark-to-model values and Greeks are single broadcasts over (dates x prices x legs).
+    """
+
+    def __init__(self, legs, spot, rate=0.0):
+        self.spot = spot
+        self.rate = rate
+        self.sign = np.array([(1.0 if leg['side'] == 'buy' else -1.0)*leg.get('qty', 1) for leg in legs])
+        self.phi = np.array([1.0 if leg['optype'] == 'call' else -1.0 for leg in legs])
+        self.strike = np.array([leg['strike'] for leg in legs], dtype=float)
+        self.premium = np.array([leg['price'] for leg in legs], dtype=float)
+        self.expiry = np.array([leg.get('expiry', 30/365) for leg in legs], dtype=float)
+        vol = np.array([leg.get('vol', np.nan) for leg in legs], dtype=float)
+        missing = np.isnan(vol)
+        if missing.any():
+            vol[missing] = ImpliedVol(self.premium[missing], spot, self.strike[missing],
+                                      self.expiry[missing], rate, self.phi[missing])
+        self.vol = vol
+
+    def payoff(self, prices):
+        """P/L at expiration for every price in the grid."""
+        S = np.asarray(prices, dtype=float)[:, None]
+        intrinsic = np.maximum(self.phi*(S - self.strike), 0)
+        return ((intrinsic - self.premium)*self.sign).sum(axis=1)
+
+    def value(self, prices, days_forward):
+        """Mark-to-model P/L, shape (len(days_forward), len(prices)); legs past expiry use intrinsic value."""
+        S = np.asarray(prices, dtype=float)[None, :, None]
+        T = self.expiry - np.asarray(days_forward, dtype=float)[:, None, None]/365
+        model = BlackScholes(S, self.strike, T, self.vol, self.rate, self.phi)
+        return ((model - self.premium)*self.sign).sum(axis=2)
+
+    def greeks(self, S=None):
+        """Position delta, gamma, theta (per day) and vega (per vol point) at the given spot."""
+        S = self.spot if S is None else S
+        T = np.maximum(self.expiry, 1e-8)
+        sqrtT = np.sqrt(T)
+        d1 = (np.log(S/self.strike) + (self.rate + 0.5*self.vol**2)*T)/(self.vol*sqrtT)
+        d2 = d1 - self.vol*sqrtT
+        pdf = norm.pdf(d1)
+        delta = self.phi*norm.cdf(self.phi*d1)
+        gamma = pdf/(S*self.vol*sqrtT)
+        theta = (-S*pdf*self.vol/(2*sqrtT) - self.phi*self.rate*self.strike*np.exp(-self.rate*T)*norm.cdf(self.phi*d2))/365
+        vega = S*pdf*sqrtT/100
+        return {name: float((greek*self.sign).sum()) for name, greek in
+                (('delta', delta), ('gamma', gamma), ('theta', theta), ('vega', vega))}
+
+    def summary(self):
+        """
+        Breakevens, max profit and max loss of the expiration payoff over every price from 0 up.
+
+        The payoff is piecewise linear with kinks at the strikes, so its extremes are at S=0, at
+        a strike, or unbounded when the slope above the highest strike (the net call quantity)
+        is not zero; no plotting grid is involved.
+        """
+        knots = np.unique(np.concatenate([[0.0], self.strike]))
+        pnl = self.payoff(knots)
+        upside = (self.sign*(self.phi > 0)).sum()
+        i = np.nonzero(np.sign(pnl[:-1])*np.sign(pnl[1:]) < 0)[0]
+        breakevens = [knots[i] - pnl[i]*(knots[i + 1] - knots[i])/(pnl[i + 1] - pnl[i]), knots[pnl == 0]]
+        if upside != 0 and -pnl[-1]/upside > 0:
+            breakevens.append([knots[-1] - pnl[-1]/upside])
+        return {
+            'breakevens': np.unique(np.round(np.concatenate(breakevens), 2)).tolist(),
+            'max_profit': np.inf if upside > 0 else float(pnl.max()),
+            'max_loss': -np.inf if upside < 0 else float(pnl.min()),
+        }
 
 
 import tkinter as tk
@@ -67,6 +228,9 @@ class Options(tk.Tk):
         self.STOCKPRICE = []
         self.PAYOFF = []
 
+        self.options_data = None  # set once the first fetch completes
+        self.fetcher = ChainFetcher()
+        self.protocol('WM_DELETE_WINDOW', self.onClose)
 
         ctrl_frame = tk.Frame(self)
         ctrl_frame.pack(side=tk.TOP)
@@ -81,6 +245,10 @@ class Options(tk.Tk):
         self.controlFrame(ctrl_frame, ctrl_frame2)
         self.graphFrame(graph_frame)
 
+    def onClose(self):
+        self.fetcher.close()
+        self.destroy()
+
     def graphFrame(self, frame):
         fig = Figure(figsize=(8, 4))
         self.plot = fig.add_subplot(111)
@@ -91,20 +259,49 @@ class Options(tk.Tk):
 
     def controlFrame(self, frame, frame2):
         def fetch_data():
-            ticker = self.ticker.get()
-            self.options_data = OptionsData(ticker=ticker)
-            self.options_data.fetcher()
+            ticker = self.ticker.get().strip().upper()
+            self.displayPrice.configure(text=f'Fetching {ticker}...')
+            future = self.fetcher.fetch(ticker)
+            self.after(0, lambda: on_fetched(future))
+
+        def on_fetched(future):
+            # Poll from Tk's event loop instead of blocking it while the request runs
+            if not future.done():
+                self.after(50, lambda: on_fetched(future))
+                return
+            try:
+                self.options_data = future.result()
+            except Exception as e:
+                self.displayPrice.configure(text=f'Fetch failed: {e}')
+                return
+            self.select_expiration.configure(values=self.options_data.expirations)
+            self.select_expiration.set(self.options_data.expiration)
+            show_strikes()
+            self.displayPrice.configure(text=f'Stock Price: {self.options_data.stock_price}')
+
+        def show_strikes():
             self.select_call_strikes.configure(values=self.options_data.call_strikes)
             self.select_put_strikes.configure(values=self.options_data.put_strikes)
-            self.displayPrice.configure(text=f'Stock Price: {self.options_data.stock_price}')
+            self.select_call_strikes.set('')
+            self.select_put_strikes.set('')
+
+        def on_expiration_select(evt):
+            if self.options_data is None or self.select_expiration.get() not in self.options_data.chains:
+                return
+            self.options_data.select(self.select_expiration.get())
+            show_strikes()
             
         def on_call_select(evt):
+            if self.options_data is None:
+                return
             strike = float(self.select_call_strikes.get())
             i = self.options_data.call_strikes.index(strike)
             self.selected_call_strike = self.options_data.call_strikes[i]
             self.selected_call_price = self.options_data.call_prices[i]
 
         def on_put_select(evt):
+            if self.options_data is None:
+                return
             strike = float(self.select_put_strikes.get())
             i = self.options_data.put_strikes.index(strike)
             self.selected_put_strike = self.options_data.put_strikes[i]
@@ -119,58 +316,71 @@ class Options(tk.Tk):
             self.canvas.draw()
 
         def BuyCall():
+            if self.options_data is None:
+                return
             self.OPTIONS.append({'side':'buy','price':float(self.selected_call_price),
-                                 'strike':float(self.selected_call_strike),'optype':'call'})
+                                 'strike':float(self.selected_call_strike),'optype':'call',
+                                 'expiry':self.options_data.yearsToExpiry()})
 
             self.selected_options.configure(text=OpTable(self.OPTIONS))
 
         def SellCall():
+            if self.options_data is None:
+                return
             self.OPTIONS.append({'side':'sell','price':float(self.selected_call_price),
-                                 'strike':float(self.selected_call_strike),'optype':'call'})
+                                 'strike':float(self.selected_call_strike),'optype':'call',
+                                 'expiry':self.options_data.yearsToExpiry()})
 
             self.selected_options.configure(text=OpTable(self.OPTIONS))
 
         def BuyPut():
+            if self.options_data is None:
+                return
             self.OPTIONS.append({'side':'buy','price':float(self.selected_put_price),
-                                 'strike':float(self.selected_put_strike),'optype':'put'})
+                                 'strike':float(self.selected_put_strike),'optype':'put',
+                                 'expiry':self.options_data.yearsToExpiry()})
             self.selected_options.configure(text=OpTable(self.OPTIONS))
 
         def SellPut():
+            if self.options_data is None:
+                return
             self.OPTIONS.append({'side':'sell','price':float(self.selected_put_price),
-                                 'strike':float(self.selected_put_strike),'optype':'put'})
+                                 'strike':float(self.selected_put_strike),'optype':'put',
+                                 'expiry':self.options_data.yearsToExpiry()})
         
             self.selected_options.configure(text=OpTable(self.OPTIONS))
 
         def ComputePayoffs():
+            if not self.OPTIONS or self.options_data is None or self.options_data.stock_price is None:
+                return
             stockPrice = self.options_data.stock_price
-            dS = int(stockPrice*0.5)
-            lower = np.max([stockPrice - dS, 0])
+            dS = stockPrice*0.5
+            lower = max(stockPrice - dS, 0.01)
             upper = stockPrice + dS
-            A = np.arange(lower, upper+1, 1).tolist()
-            TABLE = []
-            for option in self.OPTIONS:
-                if option['side'] == 'buy':
-                    if option['optype'] == 'call':
-                        TABLE.append([np.max([price - option['strike'], 0]) for price in A])
-                        TABLE.append([-option['price'] for price in A])
-                    if option['optype'] == 'put':
-                        TABLE.append([np.max([option['strike'] - price, 0]) for price in A])
-                        TABLE.append([-option['price'] for price in A])
-                if option['side'] == 'sell':
-                    if option['optype'] == 'call':
-                        TABLE.append([-np.max([price - option['strike'], 0]) for price in A])
-                        TABLE.append([option['price'] for price in A])
-                    if option['optype'] == 'put':
-                        TABLE.append([-np.max([option['strike'] - price, 0]) for price in A])
-                        TABLE.append([option['price'] for price in A])
-            
-            TABLE = np.array(TABLE).T.tolist()
-            self.PAYOFF = [np.sum([float(j) for j in i]) for i in TABLE]
+            A = np.linspace(lower, upper, 2001)
+            strategy = Strategy(self.OPTIONS, stockPrice)
+            self.STOCKPRICE = A
+            self.PAYOFF = strategy.payoff(A)
+
+            # Mark-to-model curves from today to just before the nearest expiration
+            horizon = strategy.expiry.min()*365
+            days = np.linspace(0, horizon, 4)[:-1]
+            marks = strategy.value(A, days)
+
+            stats = strategy.summary()
+            greeks = strategy.greeks()
 
             self.plot.cla()
-            Z = np.zeros(len(A))
-            self.plot.plot(A, Z, color='limegreen')
-            self.plot.plot(A, self.PAYOFF, color='red')
+            self.plot.axhline(0, color='limegreen')
+            for day, mark in zip(days, marks):
+                self.plot.plot(A, mark, linewidth=1, alpha=0.6, label=f'T+{day:.0f}d')
+            self.plot.plot(A, self.PAYOFF, color='red', label='Expiration')
+            for be in [be for be in stats['breakevens'] if lower <= be <= upper]:
+                self.plot.axvline(be, color='gray', linestyle='dotted', linewidth=1)
+            self.plot.legend(loc='upper left', fontsize=8)
+            self.plot.set_title(f"Breakevens: {stats['breakevens']}  Max Profit: {stats['max_profit']:.2f}  Max Loss: {stats['max_loss']:.2f}\n"
+                                f"Delta: {greeks['delta']:.2f}  Gamma: {greeks['gamma']:.4f}  Theta: {greeks['theta']:.2f}  Vega: {greeks['vega']:.2f}",
+                                fontsize=8)
             self.canvas.draw()
 
             
@@ -180,9 +390,14 @@ class Options(tk.Tk):
         tk.Label(frame, text='Ticker').grid(row=2, column=1)
         tk.Label(frame, text='Call Strike').grid(row=2, column=2)
         tk.Label(frame, text='Put Strike').grid(row=2, column=3)
+        tk.Label(frame, text='Expiration').grid(row=2, column=4)
         self.ticker = ttk.Entry(frame, justify='center', width=10)
         self.ticker.grid(row=3, column=1)
-        tk.Button(frame, text='Fetch', command=lambda: fetch_data()).grid(row=3, column=4)
+        tk.Button(frame, text='Fetch', command=lambda: fetch_data()).grid(row=3, column=5)
+
+        expiration = tk.StringVar()
+        self.select_expiration = ttk.Combobox(frame, width=12, values=[], textvariable=expiration, state='readonly')
+        self.select_expiration.grid(row=3, column=4)
 
         callstrike = tk.StringVar()
         self.select_call_strikes = ttk.Combobox(frame, width=10, values=[], textvariable=callstrike)
@@ -205,6 +420,7 @@ class Options(tk.Tk):
 
         self.select_call_strikes.bind("<<ComboboxSelected>>", on_call_select)
         self.select_put_strikes.bind("<<ComboboxSelected>>", on_put_select)
+        self.select_expiration.bind("<<ComboboxSelected>>", on_expiration_select)
         
 
 
@@ -0,0 +1,120 @@
+import os
+import re
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".price_cache")
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+OVERLAP_DAYS = 5
+EXCHANGE_TZ = 'America/New_York'
+SESSION_SETTLED = pd.Timedelta(hours=16, minutes=30)  # closes are final a little after the 16:00 bell
+
+
+def cache_file(symbol):
+    """CSV file holding the cached daily history of a symbol ('^VIX' is stored as '_VIX.csv')."""
+    return os.path.join(CACHE_DIR, re.sub(r'[^A-Za-z0-9.=-]', '_', symbol.upper()) + '.csv')
+
+
+def _download(symbol, start):
+    data = yf.download(symbol, start=start, auto_adjust=False, progress=False)
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = data.columns.get_level_values(0)
+    data = data.reindex(columns=PRICE_COLUMNS)
+    data.index = pd.DatetimeIndex(data.index).tz_localize(None).normalize()
+    data.index.name = 'Date'
+    return data.dropna(how='all')
+
+
+def _last_session_close(now=None):
+    """Exchange-time moment the most recent weekday session's close became final."""
+    now = now or pd.Timestamp.now(tz=EXCHANGE_TZ)
+    day = now.normalize()
+    if now - day < SESSION_SETTLED:
+        day -= pd.Timedelta(days=1)
+    session = np.busday_offset(day.date(), 0, roll='backward')
+    return pd.Timestamp(session).tz_localize(EXCHANGE_TZ) + SESSION_SETTLED
+
+
+def _is_stale(cached, path):
+    """
+    True when the cache misses the last expected session and was not refreshed since it closed.
+
+    Weekends never count as missing sessions; on a weekday holiday the first refresh after the
+    close finds nothing new, and the file's modification time stops further downloads that day.
+    """
+    if cached is None or cached.empty:
+        return True
+    last_close = _last_session_close()
+    if cached.index.max() >= last_close.tz_localize(None).normalize():
+        return False
+    return pd.Timestamp(os.path.getmtime(path), unit='s', tz='UTC') < last_close
+
+
+def _overlap_agrees(cached, fresh):
+    """Whether cached and freshly downloaded closes agree on their common dates (same adjustment basis)."""
+    common = cached.index.intersection(fresh.index)
+    for column in ('Adj Close', 'Close'):
+        old, new = cached.loc[common, column], fresh.loc[common, column]
+        both = old.notna() & new.notna()
+        if not np.allclose(old[both], new[both], rtol=1e-4):
+            return False
+    return True
+
+
+def load_prices(symbol, start=None, end=None, offline_mode=False):
+    """
+    Daily OHLC/Adj Close/Volume history for a symbol from the local cache, updated incrementally.
+
+    The first call downloads the full history; later calls only download the days since the
+    last cached row (plus a few overlapping days, so revised closes replace stale ones) and
+    append them. If the overlapping closes disagree, a split or dividend has re-adjusted the
+    history and the full history is downloaded again instead of mixing two adjustment bases.
+    No download happens while the cache already holds the last expected session. In offline
+    mode the cache is returned as is.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = cache_file(symbol)
+    cached = pd.read_csv(path, index_col='Date', parse_dates=['Date']) if os.path.exists(path) else None
+
+    if offline_mode:
+        if cached is None:
+            print(f"No cached data available for {symbol}. Please switch to online mode to fetch data.")
+            return pd.DataFrame(columns=PRICE_COLUMNS)
+        data = cached
+    elif _is_stale(cached, path):
+        fetch_start = "1900-01-01" if cached is None or cached.empty else (cached.index.max() - pd.Timedelta(days=OVERLAP_DAYS)).strftime('%Y-%m-%d')
+        try:
+            fresh = _download(symbol, fetch_start)
+        except Exception as e:
+            print(f"Failed to update {symbol}: {e}")
+            fresh = pd.DataFrame(columns=PRICE_COLUMNS)
+        if cached is not None and len(cached) and len(fresh) and not _overlap_agrees(cached, fresh):
+            print(f"{symbol} history was re-adjusted (split or dividend); downloading it again.")
+            try:
+                fresh = _download(symbol, "1900-01-01")
+                cached = None if len(fresh) else cached
+            except Exception as e:
+                print(f"Failed to re-download {symbol}: {e}")
+                fresh = pd.DataFrame(columns=PRICE_COLUMNS)
+        if cached is None:
+            data = fresh
+        else:
+            data = pd.concat([cached[cached.index < fresh.index.min()] if len(fresh) else cached, fresh])
+        if len(data):
+            data.to_csv(path)
+    else:
+        data = cached
+
+    if start is not None:
+        data = data[data.index >= pd.Timestamp(start)]
+    if end is not None:
+        data = data[data.index <= pd.Timestamp(end)]
+    return data
+
+
+def load_close(symbol, start=None, end=None, column='Adj Close', offline_mode=False):
+    """Single price column of a symbol's cached history as a Series named after the symbol."""
+    data = load_prices(symbol, start, end, offline_mode)
+    series = data[column] if data[column].notna().any() else data['Close']
+    return series.dropna().rename(symbol)
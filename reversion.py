@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+
+def next_exit_index(exit_mask):
+    """
+    For every position i, the first position j > i where exit_mask is True (len(exit_mask) if none).
+
+    One reverse running minimum over the exit positions answers every position at once.
+    """
+    exit_mask = np.asarray(exit_mask, dtype=bool)
+    n = len(exit_mask)
+    positions = np.where(exit_mask, np.arange(n), n)
+    first_from = np.minimum.accumulate(positions[::-1])[::-1]
+    return np.append(first_from[1:], n)
+
+
+def reversion_episodes(series, entry_level, exit_level, side='above', dedupe=True):
+    """
+    Time from each excursion past entry_level until the series crosses back past exit_level.
+
+    side='above' is the VIX case (enter on a close > entry_level, exit on the first later close
+    < exit_level); side='below' mirrors it for drawdowns or breadth washouts (enter < entry_level,
+    exit > exit_level). With dedupe, entries that share the same exit form one episode and
+    only the first entry day is kept.
+
+    Returns a frame with entryDate, exitDate, sessions (trading sessions), calendarDays,
+    extreme (peak or trough before the exit), entryDays and resolved.
+    """
+    series = pd.Series(series).dropna()
+    values = series.to_numpy(dtype=float)
+    n = len(values)
+    if side == 'above':
+        entry_mask, exit_mask = values > entry_level, values < exit_level
+    elif side == 'below':
+        entry_mask, exit_mask = values < entry_level, values > exit_level
+    else:
+        raise ValueError("side must be 'above' or 'below'.")
+
+    entries = np.flatnonzero(entry_mask)
+    exits = next_exit_index(exit_mask)[entries]
+    if dedupe and len(entries):
+        first = np.concatenate([[True], exits[1:] != exits[:-1]])
+        entry_days = np.diff(np.append(np.flatnonzero(first), len(entries)))
+        entries, exits = entries[first], exits[first]
+    else:
+        entry_days = np.ones(len(entries), dtype=int)
+
+    # Extreme from each entry up to its exit: a running max/min restarted at every exit, scanned backwards
+    segment = np.cumsum(exit_mask)[::-1]
+    backwards = pd.Series(values[::-1]).groupby(segment)
+    running = (backwards.cummax() if side == 'above' else backwards.cummin()).to_numpy()[::-1]
+    extreme = running[entries]
+
+    resolved = exits < n
+    dates = series.index
+    entry_dates = dates[entries]
+    exit_dates = pd.DatetimeIndex([dates[e] if e < n else pd.NaT for e in exits])
+    return pd.DataFrame({
+        'entryDate': entry_dates,
+        'exitDate': exit_dates,
+        'sessions': np.where(resolved, exits - entries, np.nan),
+        'calendarDays': (exit_dates - entry_dates).days,
+        'extreme': extreme,
+        'entryDays': entry_days,
+        'resolved': resolved,
+    })
+
+
+def duration_grid(series, entry_levels, exit_levels, side='above', stat='median'):
+    """Episode duration statistic (in sessions) for every entry/exit level pair, as an entry x exit frame."""
+    grid = pd.DataFrame(np.nan, index=pd.Index(entry_levels, name='entry'), columns=pd.Index(exit_levels, name='exit'))
+    for entry in entry_levels:
+        for exit_level in exit_levels:
+            if (side == 'above' and exit_level > entry) or (side == 'below' and exit_level < entry):
+                continue
+            sessions = reversion_episodes(series, entry, exit_level, side)['sessions'].dropna()
+            if len(sessions):
+                grid.loc[entry, exit_level] = getattr(sessions, stat)()
+    return grid
+
+
+def plot_duration_heatmap(grid, title='Sessions to Revert', ax=None):
+    """Heatmap of a duration_grid with the values written in each cell."""
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(12, 8))
+    image = ax.pcolormesh(np.arange(grid.shape[1] + 1), np.arange(grid.shape[0] + 1), grid.to_numpy(), cmap='YlOrRd')
+    for (i, j), value in np.ndenumerate(grid.to_numpy()):
+        if not np.isnan(value):
+            ax.text(j + 0.5, i + 0.5, f'{value:.0f}', ha='center', va='center', fontsize=8)
+    ax.set_xticks(np.arange(grid.shape[1]) + 0.5)
+    ax.set_xticklabels([f'{c:g}' for c in grid.columns])
+    ax.set_yticks(np.arange(grid.shape[0]) + 0.5)
+    ax.set_yticklabels([f'{i:g}' for i in grid.index])
+    ax.set_xlabel('Exit Level')
+    ax.set_ylabel('Entry Level')
+    ax.set_title(title)
+    plt.colorbar(image, ax=ax, label='Trading Sessions')
+    return ax
@@ -0,0 +1,5 @@
+def read_watchlist(path):
+    """Symbols from a text file, one per line or comma separated; '#' starts a comment."""
+    with open(path) as f:
+        text = ' '.join(line.split('#')[0] for line in f)
+    return [s.strip().upper() for s in text.replace(',', ' ').split() if s.strip()]